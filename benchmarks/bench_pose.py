@@ -0,0 +1,330 @@
+"""
+📌 포즈 처리 핵심 경로 벤치마크
+- 합성 프레임/키포인트와 assets 샘플(frame_0.jpg, video_0.gif, sam_mask_0.jpg)로 측정
+- 항목별 p50/p95/p99 지연 시간(ms)과 처리량(개/초)을 JSON으로 출력
+- 실행: 프로젝트 루트에서 `python benchmarks/bench_pose.py`
+- 전체 항목을 --repeats회 번갈아 실행하고 회차별 통계의 중앙값 사용 (일시적인 부하로 한 회차만 느려지는 경우 무시)
+- 기준값 저장: `python benchmarks/bench_pose.py --save-baseline`
+- 기준값 비교: `python benchmarks/bench_pose.py --baseline` (p50이 threshold 이상 느려지면 exit code 1)
+- 기준값(baseline.json)은 비교할 장비에서 직접 저장 (장비마다 결과가 달라 저장소에는 포함하지 않음)
+- 모델이 필요한 항목(YOLO 종단간 FPS, SAM 프롬프트 디코딩)은 라이브러리/가중치가 없으면 건너뜀
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # 프로젝트 루트 (perfectpose 패키지)
+sys.path.append(os.path.join(ROOT, "sanggyeom"))
+
+from perfectpose.frame_extractor import extract_frames
+from perfectpose.pose_codec import encode_frame
+from perfectpose.pose_frame import NUM_KEYPOINTS, PoseFrame
+from perfectpose.sam_render import render_outline, simplify_contours
+from perfectpose.scoring import score_matrix
+from sample_pose_estimation import compare_poses
+
+ASSETS = os.path.join(ROOT, "assets")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 벤치마크 항목 : 이름 -> 함수 (등록 순서대로 실행)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+class Skip(Exception):
+    """
+    필요한 라이브러리/가중치가 없어 건너뛰는 항목
+    """
+
+
+def measure(fn, runs=100, warmup=5, items=1, max_seconds=10.0):
+    """
+    📌 fn()을 반복 실행하여 지연 시간 통계 계산
+    - items: fn() 한 번에 처리하는 개수 (처리량 계산용)
+    - max_seconds를 넘으면 runs에 못 미쳐도 측정 종료
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    deadline = time.perf_counter() + max_seconds
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+
+    timings = np.asarray(timings) * 1000
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(timings.mean()), 4),
+        "throughput_per_s": round(items * 1000 / float(timings.mean()), 1),
+        "runs": len(timings),
+        "items_per_run": items,
+    }
+
+
+def aggregate(results):
+    """
+    📌 같은 항목의 회차별 측정 결과 → 통계별 중앙값 (runs는 합계)
+    """
+    if len(results) == 1:
+        return results[0]
+    merged = {
+        key: round(float(np.median([result[key] for result in results])), 4)
+        for key in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "throughput_per_s")
+    }
+    merged["p50_min_ms"] = min(result["p50_ms"] for result in results)
+    merged["runs"] = sum(result["runs"] for result in results)
+    merged["items_per_run"] = results[0]["items_per_run"]
+    merged["repeats"] = len(results)
+    return merged
+
+
+def synthetic_keypoints(num_people, seed=0):
+    # 640x480 프레임 기준 임의 키포인트 (P, 17, 3)
+    rng = np.random.default_rng(seed)
+    keypoints = rng.random((num_people, NUM_KEYPOINTS, 3), dtype=np.float32)
+    keypoints[..., 0] *= 640
+    keypoints[..., 1] *= 480
+    return keypoints
+
+
+class _FakeTensor:
+    # YOLO Result.keypoints.data 대신 사용하는 합성 데이터 (.cpu().numpy() 지원)
+    def __init__(self, array):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+
+class _FakeResult:
+    def __init__(self, keypoints):
+        self.keypoints = SimpleNamespace(data=_FakeTensor(keypoints))
+
+
+@benchmark("keypoint_extraction")
+def bench_keypoint_extraction(args):
+    # YOLO 결과(3명) → PoseFrame → 사람 단위 키포인트 리스트
+    result = _FakeResult(synthetic_keypoints(3))
+    return measure(lambda: PoseFrame.from_result(result).to_pose_data(), runs=args.runs)
+
+
+@benchmark("compare_poses")
+def bench_compare_poses(args):
+    # 키포인트 목록 두 개 비교 (API /compare 경로)
+    user, guide = synthetic_keypoints(2, seed=1)
+    user_keypoints = PoseFrame(user).to_pose_data(conf_threshold=0.0)[0]["keypoints"]
+    guide_keypoints = PoseFrame(guide).to_pose_data(conf_threshold=0.0)[0]["keypoints"]
+    return measure(lambda: compare_poses(user_keypoints, guide_keypoints), runs=args.runs)
+
+
+@benchmark("score_matrix_1x1000")
+def bench_score_matrix(args):
+    # 사용자 포즈 1개 vs 가이드 포즈 1000개
+    user, guides = synthetic_keypoints(1, seed=2), synthetic_keypoints(1000, seed=3)
+    return measure(lambda: score_matrix(user, guides), runs=args.runs, items=1000)
+
+
+@benchmark("pose_json")
+def bench_pose_json(args):
+    # PoseFrame(3명) → 응답 딕셔너리 → JSON 문자열
+    pose_frame = PoseFrame(synthetic_keypoints(3))
+    return measure(lambda: json.dumps(pose_frame.to_response()), runs=args.runs)
+
+
+@benchmark("pose_binary")
+def bench_pose_binary(args):
+    # PoseFrame(3명) → 바이너리 프레임 (WebSocket 형식)
+    pose_frame = PoseFrame(synthetic_keypoints(3))
+    return measure(lambda: encode_frame(pose_frame, 1, 0.0), runs=args.runs)
+
+
+@benchmark("frame_extraction")
+def bench_frame_extraction(args):
+    # assets/video_0.gif 전체 프레임 추출 (워커 1개)
+    video_path = os.path.join(ASSETS, "video_0.gif")
+    frame_count = int(cv2.VideoCapture(video_path).get(cv2.CAP_PROP_FRAME_COUNT))
+    output_dir = tempfile.mkdtemp(prefix="bench_frames_")
+    try:
+        return measure(
+            lambda: extract_frames(video_path, output_dir, every=1, workers=1),
+            runs=max(args.runs // 20, 3), warmup=1, items=frame_count,
+        )
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+@benchmark("sam_outline_render")
+def bench_sam_outline(args):
+    # SAM 마스크 → 점선 외곽선 렌더링 + 외곽선 단순화
+    mask = cv2.imread(os.path.join(ASSETS, "sam_mask_0.jpg"), cv2.IMREAD_GRAYSCALE)
+    masks = (mask < 128)[None]
+
+    def run():
+        render_outline(masks, mask.shape)
+        simplify_contours(masks)
+
+    return measure(run, runs=max(args.runs // 2, 20))
+
+
+@benchmark("sam_prompt_decode")
+def bench_sam_prompt_decode(args):
+    # 이미지 embedding 계산 이후 상자 프롬프트 → 마스크 디코딩 (SAM_CHECKPOINT 필요)
+    checkpoint = os.environ.get("SAM_CHECKPOINT")
+    if not checkpoint or not os.path.exists(checkpoint):
+        raise Skip("SAM_CHECKPOINT가 설정되지 않았습니다.")
+    try:
+        import torch
+        from segment_anything import SamPredictor, sam_model_registry
+    except ImportError as e:
+        raise Skip(str(e))
+
+    sam = sam_model_registry[os.environ.get("SAM_MODEL_TYPE", "vit_b")](checkpoint=checkpoint)
+    predictor = SamPredictor(sam)
+    image = cv2.cvtColor(cv2.imread(os.path.join(ASSETS, "frame_0.jpg")), cv2.COLOR_BGR2RGB)
+    predictor.set_image(image)
+    height, width = image.shape[:2]
+    box = predictor.transform.apply_boxes_torch(
+        torch.tensor([[width * 0.25, height * 0.1, width * 0.75, height * 0.9]]), image.shape[:2]
+    )
+
+    def run():
+        with torch.no_grad():
+            predictor.predict_torch(point_coords=None, point_labels=None, boxes=box, multimask_output=False)
+
+    return measure(run, runs=max(args.runs // 10, 5))
+
+
+@benchmark("e2e_yolo_fps")
+def bench_e2e(args):
+    # 프레임 한 장 : YOLO-Pose 추론 → PoseFrame → 응답 JSON (실시간 루프 1회)
+    try:
+        import ultralytics  # noqa: F401
+    except ImportError as e:
+        raise Skip(str(e))
+    from perfectpose.backends import YoloPoseBackend
+
+    backend = YoloPoseBackend(weights=os.environ.get("YOLO_POSE_MODEL", "yolov8n-pose.pt"))
+    frame = cv2.imread(os.path.join(ASSETS, "frame_0.jpg"))
+    return measure(lambda: json.dumps(backend(frame).to_response()), runs=max(args.runs // 5, 10), warmup=2)
+
+
+def compare(report, baseline, threshold=0.25, slack_ms=0.5):
+    """
+    📌 기준값과 비교하여 회귀 목록 반환
+    - 회차별 p50 중 가장 빠른 값도 max(기준 p50 × (1 + threshold), 기준 p50 + slack_ms) 를 넘으면 회귀
+      (실제 회귀는 모든 회차가 느려지고, 일시적인 부하는 일부 회차만 느려짐)
+    - slack_ms: 짧은 항목에 주는 최소 허용 폭 (밀리초 단위 항목은 스케줄링 잡음만으로 수십 % 흔들림)
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "p50_ms" not in base or "p50_ms" not in result:
+            continue
+        limit = max(base["p50_ms"] * (1 + threshold), base["p50_ms"] + slack_ms)
+        fastest = result.get("p50_min_ms", result["p50_ms"])
+        if fastest > limit:
+            regressions.append(f"{name}: p50 {fastest}ms > {limit:.4f}ms (기준 {base['p50_ms']}ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="포즈 처리 핵심 경로 벤치마크")
+    parser.add_argument("names", nargs="*", help=f"실행할 항목 (기본값: 전체) {list(BENCHMARKS)}")
+    parser.add_argument("--runs", type=int, default=200, help="항목별 기본 반복 횟수")
+    parser.add_argument("--repeats", type=int, default=5, help="전체 항목 반복 회차 (회차별 통계의 중앙값 사용)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, default=None, help="비교할 기준값 JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, default=None, help="결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용 비율 (0.25 = p50 25%% 증가까지 허용)")
+    parser.add_argument("--slack-ms", type=float, default=0.5, help="짧은 항목의 최소 허용 증가량 (ms)")
+    args = parser.parse_args()
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {sorted(unknown)}")
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"기준값 파일이 없습니다: {args.baseline} (비교할 장비에서 --save-baseline으로 먼저 저장)")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {},
+    }
+    names = args.names or list(BENCHMARKS)
+    runs = {name: [] for name in names}
+    skipped = {}
+    for _ in range(max(args.repeats, 1)):
+        # 항목을 번갈아 실행하여 일시적인 부하가 한 항목에 몰리지 않도록 함
+        for name in names:
+            if name in skipped:
+                continue
+            try:
+                runs[name].append(BENCHMARKS[name](args))
+            except Skip as e:
+                skipped[name] = str(e)
+
+    for name in names:
+        if name in skipped:
+            result = {"skipped": skipped[name]}
+            print(f"{name:<22} 건너뜀: {skipped[name]}")
+        else:
+            result = aggregate(runs[name])
+            print(f"{name:<22} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+                  f"p99 {result['p99_ms']:>9.3f} ms  {result['throughput_per_s']:>10.1f} /s")
+        report["results"][name] = result
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            print(f"결과 저장: {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        changed = {key: (value, report["meta"].get(key)) for key, value in baseline.get("meta", {}).items()
+                   if report["meta"].get(key) != value}
+        if changed:
+            print(f"⚠️ 기준값과 측정 환경이 다릅니다 (기준 → 현재): {changed}")
+        regressions = compare(report, baseline, threshold=args.threshold, slack_ms=args.slack_ms)
+        for message in regressions:
+            print(f"❌ {message}")
+        if regressions:
+            sys.exit(1)
+        print("✅ 기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
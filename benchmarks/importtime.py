@@ -0,0 +1,171 @@
+"""
+📌 import 시간 벤치마크 (python -X importtime 기반)
+- 각 진입점 모듈을 새 프로세스에서 import하여 누적 import 시간과 무거운 라이브러리 import 여부 측정
+- 작업 폴더 모듈(sanggyeom/pose_api.py 등)은 해당 폴더를 import 경로에 추가하여 측정
+- import 중 현재 폴더에 파일을 만드는 진입점(예: SQLite 캐시 파일)도 회귀로 판단
+- 실행: 프로젝트 루트에서 `python benchmarks/importtime.py`
+- 기준값 저장: `python benchmarks/importtime.py --save-baseline`
+- 기준값 비교: `python benchmarks/importtime.py --baseline` (느려졌거나 무거운 라이브러리가 새로 import되면 exit code 1)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_baseline.json")
+
+# 빠르게 시작해야 하는 진입점 (CLI 도구, 공통 모듈, 작업 폴더의 서비스/도구 모듈 "폴더/파일.py")
+ENTRY_POINTS = [
+    "perfectpose",
+    "perfectpose.scoring",
+    "perfectpose.pose_frame",
+    "perfectpose.pose_stream",
+    "perfectpose.pose_codec",
+    "perfectpose.pose_features",
+    "perfectpose.guide_library",
+    "perfectpose.model_registry",
+    "perfectpose.frame_extractor",
+    "perfectpose.sam_job",
+    "sanggyeom/pose_api.py",
+    "sanggyeom/sample_llm_integration.py",
+    "jangheon/utils.py",
+    "hyeongseob/utils.py",
+]
+
+# 진입점 import 시 불러오면 안 되는 무거운 라이브러리 (첫 사용 시 import 해야 함)
+HEAVY_MODULES = ("torch", "ultralytics", "transformers", "segment_anything", "matplotlib", "PIL", "scipy")
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력 → (전체 누적 시간 us, {모듈 이름: 누적 시간 us})
+    - 들여쓰기 없는 줄(최상위 import)의 누적 시간 합이 전체 import 시간
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # "import time:   self |   cumulative | <들여쓰기>name"
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative = int(cumulative)
+        modules[name.strip()] = max(modules.get(name.strip(), 0), cumulative)
+        if not name[1:].startswith(" "):
+            total += cumulative
+    return total, modules
+
+
+def import_target(entry):
+    """
+    진입점 → (import 경로에 추가할 폴더, 모듈 이름)
+    - "sanggyeom/pose_api.py" → (<루트>/sanggyeom, "pose_api"), "perfectpose.scoring" → (<루트>, "perfectpose.scoring")
+    """
+    if entry.endswith(".py"):
+        folder, filename = os.path.split(entry)
+        return os.path.join(ROOT, folder), filename[:-3]
+    return ROOT, entry
+
+
+def measure(entry, repeat=3):
+    """
+    📌 진입점 하나의 import 시간 측정 (repeat회 중 가장 빠른 값)
+    - 빈 임시 폴더에서 실행하여 import 중 만들어진 파일 확인
+    - 출력: {"total_ms", "heavy": 불러온 무거운 라이브러리 목록, "created": import 중 만든 파일,
+            "top": 가장 오래 걸린 모듈 5개}
+    """
+    folder, module = import_target(entry)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [folder, os.environ.get("PYTHONPATH")])))
+
+    best = None
+    created = set()
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="importtime_") as cwd:
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=cwd, env=env, capture_output=True, text=True,
+            )
+            created.update(os.listdir(cwd))
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1]}
+        total, modules = parse_importtime(completed.stderr)
+        if best is None or total < best[0]:
+            best = (total, modules)
+
+    total, modules = best
+    top = sorted(
+        ((name, cumulative) for name, cumulative in modules.items() if name != module and "." not in name),
+        key=lambda item: item[1], reverse=True,
+    )[:5]
+    return {
+        "total_ms": round(total / 1000, 1),
+        "heavy": sorted(name for name in HEAVY_MODULES if name in modules),
+        "created": sorted(created),
+        "top": [[name, round(cumulative / 1000, 1)] for name, cumulative in top],
+    }
+
+
+def compare(report, baseline, threshold=1.5, slack_ms=20.0):
+    """
+    📌 기준값과 비교하여 회귀 목록 반환
+    - import 시간이 기준값 × threshold + slack_ms 를 넘거나, 무거운 라이브러리를 새로 import하거나,
+      import 중 새 파일을 만들면 회귀
+    """
+    regressions = []
+    for module, result in report.items():
+        base = baseline.get(module)
+        if base is None or "error" in result or "error" in base:
+            continue
+        limit = base["total_ms"] * threshold + slack_ms
+        if result["total_ms"] > limit:
+            regressions.append(f"{module}: {result['total_ms']}ms > {limit:.1f}ms (기준 {base['total_ms']}ms)")
+        new_heavy = sorted(set(result["heavy"]) - set(base["heavy"]))
+        if new_heavy:
+            regressions.append(f"{module}: 무거운 라이브러리 import 추가 {new_heavy}")
+        new_files = sorted(set(result["created"]) - set(base.get("created", [])))
+        if new_files:
+            regressions.append(f"{module}: import 중 파일 생성 {new_files}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진입점 모듈 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="측정할 모듈 또는 폴더/파일.py (기본값: 주요 진입점)")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, default=None, help="비교할 기준값 JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, default=None, help="결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=1.5, help="허용 배율 (기준값 대비)")
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        report[module] = result = measure(module, repeat=args.repeat)
+        if "error" in result:
+            print(f"{module:<36} 오류: {result['error']}")
+        else:
+            heavy = f"  ⚠️ {', '.join(result['heavy'])}" if result["heavy"] else ""
+            created = f"  ⚠️ 파일 생성: {', '.join(result['created'])}" if result["created"] else ""
+            print(f"{module:<36} {result['total_ms']:>8.1f} ms{heavy}{created}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            print(f"결과 저장: {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), threshold=args.threshold)
+        for message in regressions:
+            print(f"❌ {message}")
+        if regressions:
+            sys.exit(1)
+        print("✅ 기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,62 @@
-from ultralytics import YOLO
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 import cv2
 import sys
 
-class PoseEstimator(YOLO):
-    def __init__(self, model_path):
-        super().__init__(model_path)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.backends import BACKENDS, YoloPoseBackend, create_backend, select_backend
+from perfectpose.batching import MicroBatcher
+from perfectpose.frame_extractor import extract_frames
+from perfectpose.image_io import iter_image_batches, list_images
+from perfectpose.model_registry import get_model
+from perfectpose.pipeline import PosePipeline
+from perfectpose.profiling import StageProfiler
+from perfectpose.smoothing import SkipFrameDetector
+from perfectpose.tracker import PoseTracker, RoiPoseDetector
+
+class PoseEstimator:
+    def __init__(self, model_path, device="cpu", warmup_runs=1, batch_size=1, batch_wait_ms=5.0):
         """
-        YOLO를 상속받는 class 생성
+        모델 저장소(model_registry)에서 공유 YOLO 모델을 받아 사용하는 class 생성
+        - 같은 가중치 경로의 모델은 프로세스 안에서 한 번만 불러옴
+        - YOLO 메서드(predict 등)는 공유 모델로 그대로 전달
+        - model_path에 .onnx 파일 / *_openvino_model 폴더를 주면 ONNX Runtime / OpenVINO로 추론
+          (perfectpose.onnx_runtime으로 변환 및 INT8 양자화)
+        - 기본값(동적 입력)으로 내보낸 모델은 .pt와 같이 사용 가능 (묶음 추론, 다른 imgsz 포함)
+          --static으로 내보낸 모델은 내보낼 때의 batch, imgsz로만 추론 가능
+        - batch_size > 1 : 여러 스레드에서 동시에 호출한 detect_pose의 프레임을 모아 한 번에 추론
+          (최대 batch_size장, 첫 프레임 이후 batch_wait_ms까지 대기, 사용이 끝나면 close() 호출)
         """
+        self.model = get_model(model_path, task="pose", device=device, warmup_runs=warmup_runs)
+        # 실시간 루프와 이미지 폴더 디텍팅이 함께 사용하는 기본 포즈 백엔드 (같은 공유 YOLO 모델)
+        self.backend = create_backend("yolo", weights=model_path, device=device)
+        self.batcher = None
+        if batch_size > 1:
+            self.batcher = MicroBatcher(self.backend.infer, max_batch=batch_size, max_wait_ms=batch_wait_ms)
         self.vcap = None
         self.output_folder = "/hyeongseob/video_extraction_image"
 
+    def __call__(self, *args, **kwargs):
+        return self.model(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # PoseEstimator에 없는 속성은 공유 YOLO 모델에서 찾음 (기존 YOLO 상속 구조와 호환)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def detect_pose(self, frame):
+        """
+        프레임 한 장 → PoseFrame (batch_size > 1이면 다른 스레드의 프레임과 묶어 추론)
+        """
+        if self.batcher is not None:
+            return self.batcher(frame)
+        return self.backend(frame)
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
+
     def start_camera(self, src=0):
         """
         웹캠 초기화 메서드
@@ -22,183 +66,186 @@ class PoseEstimator(YOLO):
             raise ConnectionError("❌ 웹캠 연결 실패")
         self.fps = int(self.vcap.get(cv2.CAP_PROP_FPS))
     
-    def video_image_extraction(self, input_video: str, fps: int):
+    def video_image_extraction(self, input_video: str, fps: int, workers=None):
         """
         비디오를 설정 된 프레임 단위로 캡처하여 저장하는 메서드
+        - 화면 출력 없이 저장할 프레임만 디코딩하고, 비디오를 구간으로 나누어 여러 프로세스에서 처리
+        - workers가 2 이상이면 호출하는 스크립트는 `if __name__ == "__main__":` 안에서 실행해야 함
+          (Windows에서는 자식 프로세스가 스크립트를 다시 import, workers=1이면 현재 프로세스에서 처리)
         """
         video_path = f"hyeongseob/video_data/{input_video}.mp4"
-        vcap = cv2.VideoCapture(video_path)
-        
-        if not vcap.isOpened():
+
+        self.output_dir = "/hyeongseob/video_extraction_image"
+
+        try:
+            # 저장 파일명 : frame_{프레임 번호}.jpg
+            extract_frames(video_path, self.output_dir, every=fps, workers=workers, prefix="frame", digits=0)
+        except IOError:
             print("비디오 파일 오류", file=sys.stderr)
             sys.exit()
 
-        self.output_dir = "/hyeongseob/video_extraction_image"
-        os.makedirs(self.output_dir, exist_ok=True)
+        return None
 
-        frame_idx = 0  # 외부에서 초기화
-        while vcap.isOpened():
-            ret, frame = vcap.read()
-            if not ret: break
-         
-            # 키포인트 처리 로직 (원본 유지)
-            
-            if frame_idx % fps == 0:
-                save_path = os.path.join(self.output_dir, f"frame_{frame_idx}.jpg")
-                cv2.imwrite(save_path, frame)
+    def _backend(self, backend=None):
+        """
+        백엔드 이름("yolo", "vitpose") 또는 PoseBackend → PoseBackend (None이면 기본 YOLO 백엔드)
+        """
+        return self.backend if backend is None else create_backend(backend)
+
+    def iter_directory_detecting(self, folder=None, batch_size=8, workers=4, save_dir=None, backend=None):
+        """
+        폴더의 이미지를 배치 단위로 디텍팅하여 이미지별 결과를 하나씩 반환하는 제너레이터
+        - 스레드 풀이 다음 이미지를 미리 읽는 동안 batch_size장씩 묶어 backend.infer 실행
+        - save_dir을 지정하면 Keypoints를 표시한 이미지를 저장
+        - backend: 포즈 백엔드 이름 또는 PoseBackend (기본값: YOLO)
+        - 출력: (이미지 파일명, pose_data)
+        """
+        backend = self._backend(backend)
+        folder = folder or self.output_folder
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
 
-            cv2.imshow("Videio Image Extraction", frame)
-            frame_idx += 1  # 정상적인 카운팅
+        with ThreadPoolExecutor(max_workers=workers) as writer:
+            for batch in iter_image_batches(list_images(folder), batch_size=batch_size, workers=workers):
+                paths, frames = zip(*batch)
 
-            if cv2.waitKey(1) == 27: break
+                # 포즈 백엔드로 이미지 감지 (배치 단위)
+                pose_frames = backend.infer(list(frames))
 
-        vcap.release()
-        cv2.destroyAllWindows()
+                for path, frame, pose_frame in zip(paths, frames, pose_frames):
+                    image = os.path.basename(path)
 
-        return None
+                    if save_dir:
+                        pose_frame.draw(frame)                                  # Keypoints 시각화
+                        writer.submit(cv2.imwrite, os.path.join(save_dir, f"{image}.jpg"), frame)
 
-        
-    def capture_image_detecting(self):
+                    yield image, pose_frame.to_pose_data()
+
+    def capture_image_detecting(self, batch_size=8, workers=4, save_dir="/hyeongseob/video_image_keypoints_save",
+                                backend=None):
         """
         저장된 이미지에서 사람을 디텍딩하여 관절 Keypoints를 추출하는 메서드
+        - backend: 포즈 백엔드 이름 또는 PoseBackend (가이드 제작 시 "vitpose"로 정확도 우선 추론)
+        - 출력: 이미지별 [{"image_name": ..., "pose": [...]}] 리스트
         """
         pose_data = []
-        keypoints_list = []
-        image_list = [f for f in os.listdir(self.output_folder) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-
-        for image in image_list:
-            image_path = os.path.join(self.output_folder, image)
-            frame = cv2.imread(image_path)
-
-            if frame is None:
-                print(f"이미지를 불러올 수 없습니다: {image}")
-                continue
-            
-            # 모델 활용하여 이미지 감지
-            results = self.predict(frame)
-        
-            for result in results:
-                keypoints = result.keypoints.xy.cpu().numpy()       # Keypoints (x, y) 좌표 값 추출
-                scores = result.keypoints.conf.cpu().numpy()        # 신뢰도 값 추출
-                for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):
-                    if score > 0.5:                                 # 신뢰도 50% 이상일 때
-                        keypoints_list.append({
-                            "id": i,
-                            "x": int(kp[0]),
-                            "y": int(kp[1]),
-                            "confidence": float(score)
-                        })
-                        cv2.circle(frame, (int(kp[0]), int(kp[1])), 5, (0,255,0), -1)   # Keypoints 시각화
-                pose_data.append({
-                    "person_id": 1,
-                    "keypoints": keypoints_list
-                })
-        
-            cv2.imwrite(f"/hyeongseob/video_image_keypoints_save/{image}.jpg", frame)
-
-        return pose_data, frame
-    
-
-    def real_time_video_detecting(self):
+        for image, image_pose in self.iter_directory_detecting(batch_size=batch_size, workers=workers, save_dir=save_dir,
+                                                               backend=backend):
+            pose_data.append({
+                "image_name": image,
+                "pose": image_pose
+            })
+
+        return pose_data
+
+    def real_time_video_detecting(self, on_response=print, show=True, queue_size=1, track=False, roi_size=None,
+                                  detect_every=1, motion_threshold=None, smooth=False, profiler=None, overlay=False,
+                                  backend=None, latency_budget_ms=None):
         """
         웹캠을 이용하여 실시간으로 디텍팅 된 사람의 Keypoints를 저장하는 메서드
+        - 캡처 스레드 → 추론 스레드 → 출력 단계(현재 스레드)로 나누어 처리
+        - 추론이 느려지면 오래된 프레임은 버리고 최신 프레임만 추론 (지연 시간 유지)
+        - on_response: pose_response 딕셔너리를 받을 콜백 (기본값: print)
+        - track: 여러 사람을 추적하여 프레임이 바뀌어도 같은 person_id 유지 (멀티플레이)
+        - roi_size: 지정하면 추적 중인 사람 주변만 잘라 해당 크기로 추론 (예: 320, track 사용)
+        - detect_every: k 프레임마다 한 번만 모델 실행, 사이 프레임은 One-Euro 필터로 관절 위치 예측
+        - motion_threshold: 화면 변화가 기준(평균 밝기 차이)을 넘으면 k 프레임 전이라도 모델 실행
+        - smooth: detect_every=1일 때도 One-Euro 필터로 관절 떨림 제거
+        - profiler: perfectpose.profiling.StageProfiler를 넘기면 단계별 지연 시간 측정
+          (capture, predict, draw, serialize, emit, imshow, frame) 및 주기적 dump
+        - overlay: 미리보기 화면에 FPS/단계별 지연 시간 표시 (profiler 사용 시)
+        - backend: 포즈 백엔드 이름 또는 PoseBackend (기본값: YOLO)
+        - latency_budget_ms: 지정하면 시작 시 백엔드별 지연 시간을 측정하여 예산 안에서 가장 정확한 백엔드 사용
         """
-        vcap = cv2.VideoCapture(0)
+        # profiler가 없으면 측정하지 않음 (비활성화된 측정기는 비용 없음)
+        profiler = profiler or StageProfiler(enabled=False)
 
+        # start_camera로 연결한 웹캠이 없으면 기본 웹캠 사용
+        if self.vcap is None or not self.vcap.isOpened():
+            self.vcap = cv2.VideoCapture(0)
+
+        vcap = self.vcap
         vcap.set(cv2.CAP_PROP_AUTOFOCUS, 0)
         vcap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         vcap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         vcap.set(cv2.CAP_PROP_FPS, 30)
+        vcap.set(cv2.CAP_PROP_BUFFERSIZE, 1)            # 카메라 내부 버퍼에 프레임이 쌓이지 않도록 설정
 
         if not vcap.isOpened():
             print("웹캠 오류", file=sys.stderr)
             sys.exit()
 
-        # 웹캠 실시간 처리 루프
-        while self.vcap.isOpened():
-            ret, frame = self.vcap.read()            # ret: 작동 여부, # frame: 카메라로 받은 이미지
-
-            # 웹캠 오류 체크
-            if not ret:
-                print("웹캠 프레임을 가져올 수 없습니다.")
-                break
-            
-            # 좌우 반전 (True)
-            frame = cv2.flip(frame, 1)
-
-            # 모델 활용하여 이미지 감지
-            results = self.predict(frame)
+        def read_frame():
+            ret, frame = vcap.read()                    # ret: 작동 여부, # frame: 카메라로 받은 이미지
+            if ret:
+                frame = cv2.flip(frame, 1)              # 좌우 반전 (True)
+            return ret, frame
 
+        def render(frame, pose_frame):
             # 감지된 좌표 값 화면에 표시
-            for result in results:
-                keypoints = result.keypoints.xy.cpu().numpy()       # tensor -> numpy 배열로 변경할때는 .cpu().numpy() 사용
-                scores = result.keypoints.conf.cpu().numpy()        # tensor -> numpy 배열로 변경할때는 .cpu().numpy() 사용
-                
-                # Keypoints 데이터 번호 정리
-                """
-                # 각 키포인트(관절)의 좌표 순번 : COCO Dataset 기준
-                # 0	Nose(코)                        얼굴 중심점
-                # 1	Left Eye(왼쪽 눈)               얼굴 왼쪽 위치
-                # 2	Right Eye (오른쪽 눈)	        얼굴 오른쪽 위치
-                # 3	Left Ear (왼쪽 귀)	            얼굴 왼쪽 끝
-                # 4	Right Ear (오른쪽 귀)	        얼굴 오른쪽 끝
-                # 5	Left Shoulder (왼쪽 어깨)	    상체 위치
-                # 6	Right Shoulder (오른쪽 어깨)	상체 위치
-                # 7	Left Elbow (왼쪽 팔꿈치)	    팔 관절
-                # 8	Right Elbow (오른쪽 팔꿈치)	    팔 관절
-                # 9	Left Wrist (왼쪽 손목)	        손 위치
-                # 10 Right Wrist (오른쪽 손목)	    손 위치
-                # 11 Left Hip (왼쪽 엉덩이)	        하체 위치
-                # 12 Right Hip (오른쪽 엉덩이)	    하체 위치
-                # 13 Left Knee (왼쪽 무릎)	        다리 관절
-                # 14 Right Knee (오른쪽 무릎)	    다리 관절
-                # 15 Left Ankle (왼쪽 발목)	        발 위치
-                # 16 Right Ankle (오른쪽 발목)	    발 위치
-                """
-                
-                # 저장소 만들기
-                pose_data = []
-                keypoints_list = []
-
-                for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):
-                    # 신뢰도 50% 이상인 경우만 포함   
-                    if score > 0.5:
-                        keypoints_list.append({
-                            "id": i,                    # 관절 ID (COCO 데이터셋 기준)
-                            "x": int(kp[0]),            # x 좌표
-                            "y": int(kp[1]),            # y 좌표
-                            "confidence": float(score)  # 신뢰도 값 (0~1)
-                        })
-
-                        # Keypoints 시각화
-                        cv2.circle(frame, (int(kp[0]), int(kp[1])), 5, (0, 255, 0), -1)
-
-                # 사람 단위로 데이터 저장
-                pose_data.append({
-                    "person_id": 1,                     # 감지된 사람 ID
-                    "keypoints": keypoints_list         # 관절 리스트
-                })
-
-            # 최종 데이터 구조 (JSON 형태로 저장 : FastAPI Data Default)
-            pose_response = {
-                "status": "success",  # 요청 성공 여부
-                "pose": pose_data,  # 감지된 포즈 데이터
-                "timestamp": datetime.utcnow().isoformat()  # 타임스탬프
-            }
-
-            print(pose_response)
-
-
-            # 감지된 결과 화면 출력
-            cv2.imshow("YOLO Pose Estimation", frame)
-
-            # 꺼지는 조건 설정
-            key = cv2.waitKey(1)
-
-            # ESC : 27 (아스키코드)
-            if key == 27:
-                break
-
-        # 웹캠 종료 및 창 닫기
-        vcap.release()
-        cv2.destroyAllWindows()
\ No newline at end of file
+            with profiler.stage("draw"):
+                pose_frame.draw(frame)
+
+            if on_response is not None:
+                # 최종 데이터 구조 (JSON 형태로 저장 : FastAPI Data Default)
+                with profiler.stage("serialize"):
+                    pose_response = pose_frame.to_response()
+                with profiler.stage("emit"):
+                    on_response(pose_response)
+
+            profiler.tick()
+            profiler.maybe_dump()
+
+            if show:
+                if overlay:
+                    profiler.draw_overlay(frame)
+
+                # 감지된 결과 화면 출력
+                with profiler.stage("imshow"):
+                    cv2.imshow("YOLO Pose Estimation", frame)
+
+                    # ESC : 27 (아스키코드)
+                    key = cv2.waitKey(1)
+                if key == 27:
+                    return False
+
+        backend = self._backend(backend)
+        if latency_budget_ms is not None:
+            candidates = [backend] + [name for name in BACKENDS if name != backend.name]
+            backend = select_backend(latency_budget_ms, backends=candidates)
+            print(f"포즈 백엔드: {backend.name} ({backend.latency_ms:.1f} ms/frame, 예산 {latency_budget_ms} ms)")
+
+        if roi_size:
+            # ROI 추론은 입력 크기(imgsz)를 바꿔 호출하므로 YOLO 백엔드 전용
+            if not isinstance(backend, YoloPoseBackend):
+                raise ValueError(f"roi_size는 YOLO 백엔드에서만 사용할 수 있습니다: {backend.name}")
+            # 추론마다 imgsz가 바뀌므로 공유 모델 대신 ROI 전용 모델 인스턴스 사용
+            roi_model = get_model(backend.weights, task="pose", device=backend.device, imgsz=backend.imgsz,
+                                  instance="roi")
+            infer = RoiPoseDetector(roi_model, PoseTracker(), roi_size=roi_size)
+        elif track:
+            tracker = PoseTracker()
+            infer = lambda frame: tracker.update(backend(frame))
+        else:
+            infer = backend
+
+        if detect_every > 1 or motion_threshold is not None or smooth:
+            # 필터 상태는 person_id별로 이어지므로 추적하지 않는 경우에도 PoseTracker로 ID 부여
+            tracked = bool(roi_size) or track
+            infer = SkipFrameDetector(infer, every=detect_every, motion_threshold=motion_threshold,
+                                      tracker=None if tracked else PoseTracker())
+
+        read_frame = profiler.wrap("capture", read_frame)
+        infer = profiler.wrap("predict", infer)
+
+        pipeline = PosePipeline(read_frame, infer, render, queue_size=queue_size)
+        try:
+            # 캡처/추론 단계에서 오류가 나면 run()이 같은 예외를 발생시킴
+            pipeline.run()
+        finally:
+            if profiler.enabled:
+                profiler.dump()
+
+            # 웹캠 종료 및 창 닫기
+            vcap.release()
+            cv2.destroyAllWindows()
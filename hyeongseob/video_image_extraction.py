@@ -1,7 +1,9 @@
 from utils import PoseEstimator
 
-# 모델 불러오기
-model = PoseEstimator("/hyeongsoeb/models/yolov8n-pose.pt")
+# 프레임 추출은 여러 프로세스를 사용하므로 __main__ 안에서 실행 (Windows spawn 방식에서 자식 프로세스가 이 스크립트를 다시 import)
+if __name__ == "__main__":
+    # 모델 불러오기
+    model = PoseEstimator("/hyeongsoeb/models/yolov8n-pose.pt")
 
-# 실시간 Pose 데이터 수집하기
-model.video_image_extraction("Jenny_solo(640, 480)", 24)
\ No newline at end of file
+    # 실시간 Pose 데이터 수집하기
+    model.video_image_extraction("Jenny_solo(640, 480)", 24)
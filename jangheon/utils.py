@@ -1,56 +1,71 @@
-from ultralytics import YOLO
-from PIL import Image
-from datetime import datetime
-import torch
 import cv2
 import os
 import sys
-import numpy as np
-import matplotlib.pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.batching import MicroBatcher
+from perfectpose.model_registry import get_model
+from perfectpose.pose_frame import PoseFrame
+from perfectpose.smoothing import SkipFrameDetector
+from perfectpose.tracker import PoseTracker
 
 
 class PoseEstimator:
-    def __init__(self, model_path):
+    def __init__(self, model_path, device="cpu", warmup_runs=1, batch_size=1, batch_wait_ms=5.0):
         """
-        YOLO 모델을 불러와 초기화.
+        모델 저장소(model_registry)에서 공유 YOLO 모델을 받아 초기화.
+        - 같은 가중치 경로의 모델은 프로세스 안에서 한 번만 불러오고 예열함
+        - model_path에 .onnx 파일 / *_openvino_model 폴더를 주면 ONNX Runtime / OpenVINO로 추론
+          (perfectpose.onnx_runtime으로 변환 및 INT8 양자화)
+        - 기본값(동적 입력)으로 내보낸 모델은 .pt와 같이 사용 가능 (묶음 추론, 다른 imgsz 포함)
+          --static으로 내보낸 모델은 내보낼 때의 batch, imgsz로만 추론 가능
+        - batch_size > 1 : 여러 스레드에서 동시에 호출한 detect_image_pose의 프레임을 모아 한 번에 추론
+          (최대 batch_size장, 첫 프레임 이후 batch_wait_ms까지 대기, 사용이 끝나면 close() 호출)
         """
-        self.model = YOLO(model_path)
+        self.model = get_model(model_path, task="pose", device=device, warmup_runs=warmup_runs)
+        self.batcher = None
+        if batch_size > 1:
+            self.batcher = MicroBatcher(self._detect_batch, max_batch=batch_size, max_wait_ms=batch_wait_ms)
+
+    def _detect_batch(self, frames):
+        # 프레임 리스트 → PoseFrame 리스트 (배처 스레드에서 한 번의 추론으로 실행)
+        return PoseFrame.from_results(self.model(list(frames), verbose=False))
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
 
     def detect_image_pose(self, frame):
         """
         주어진 프레임에서 포즈 감지 수행 후, 키포인트 좌표 반환 함수
         """
-        results = self.model(frame)
-        pose_data = []
-
-        for result in results:
-            keypoints = result.keypoints.xy.cpu().numpy()       # 키포인트 (x, y) 좌표 추출
-            scores = result.keypoints.conf.cpu().numpy()        # 신뢰도 값 추출
-
-            keypoints_list = []
-            for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):  
-                if score > 0.5:                                 # 신뢰도 50% 이상인 경우만 포함
-                    keypoints_list.append({
-                        "id": i,                                # 관절 ID
-                        "x": int(kp[0]),                        # x 좌표
-                        "y": int(kp[1]),                        # y 좌표
-                        "confidence": float(score)              # 신뢰도 값
-                    })
-                    cv2.circle(frame, (int(kp[0]), int(kp[1])), 5, (0, 255, 0), -1)  # 키포인트 시각화
-
-            # 감지된 사람 데이터 저장
-            pose_data.append({
-                "person_id": 1,                                 # 현재는 한 명 감지 기준
-                "keypoints": keypoints_list
-            })
-
-        return pose_data, frame
+        if self.batcher is not None:
+            pose_frame = self.batcher(frame)                    # 다른 호출자의 프레임과 묶어 추론
+        else:
+            results = self.model(frame)
+
+            # 감지된 모든 사람의 키포인트를 한 번에 CPU로 복사
+            pose_frame = PoseFrame.from_result(results[0])
+        pose_frame.draw(frame)                                  # 키포인트 시각화
+
+        return pose_frame.to_pose_data(), frame
     
 
-    def detect_video_pose(self, frame):
+    def detect_video_pose(self, frame=None, detect_every=1, motion_threshold=None):
         """
         실시간 웹캠을 사용하여 좌표 감지 및 화면 출력
+        - detect_every: k 프레임마다 한 번만 모델 실행, 사이 프레임은 One-Euro 필터로 관절 위치 예측
+        - motion_threshold: 화면 변화가 기준(평균 밝기 차이)을 넘으면 k 프레임 전이라도 모델 실행
         """
+        def detect(frame):
+            results = self.model(frame)
+            return PoseFrame.from_result(results[0])
+
+        if detect_every > 1 or motion_threshold is not None:
+            # 감지 순서로 붙은 ID는 사람이 자리를 바꾸면 뒤섞이므로 PoseTracker로 ID 유지
+            detect = SkipFrameDetector(detect, every=detect_every, motion_threshold=motion_threshold,
+                                       tracker=PoseTracker())
+
         vcap = cv2.VideoCapture(0)                              # 기본 웹캠 사용
 
         # 웹캠 정상 작동 확인
@@ -71,67 +86,14 @@ class PoseEstimator:
             # 3. 좌우 반전 (True)
             frame = cv2.flip(frame, 1)
 
-            # 4. 모델 활용하여 이미지 감지
-            model = PoseEstimator('./tests/KHS/models/yolov8n-pose.pt')
-            results = model(frame)
-
-            # 5. 감지된 좌표 값 화면에 표시
-            for result in results:
-                keypoints = result.keypoints.xy.cpu().numpy()       # tensor -> numpy 배열로 변경할때는 .cpu().numpy() 사용
-                scores = result.keypoints.conf.cpu().numpy()        # tensor -> numpy 배열로 변경할때는 .cpu().numpy() 사용
-                print(keypoints.shape, scores.shape)                # keypoints.shape = [사람 수, 각 사람의 키포인트 수(관절), 각 키포인트(관절)의 좌표]  
-
-                # Keypoints 데이터 번호 정리
-                """
-                # 각 키포인트(관절)의 좌표 순번 : COCO Dataset 기준
-                # 0	Nose(코)                        얼굴 중심점
-                # 1	Left Eye(왼쪽 눈)               얼굴 왼쪽 위치
-                # 2	Right Eye (오른쪽 눈)	        얼굴 오른쪽 위치
-                # 3	Left Ear (왼쪽 귀)	            얼굴 왼쪽 끝
-                # 4	Right Ear (오른쪽 귀)	        얼굴 오른쪽 끝
-                # 5	Left Shoulder (왼쪽 어깨)	    상체 위치
-                # 6	Right Shoulder (오른쪽 어깨)	상체 위치
-                # 7	Left Elbow (왼쪽 팔꿈치)	    팔 관절
-                # 8	Right Elbow (오른쪽 팔꿈치)	    팔 관절
-                # 9	Left Wrist (왼쪽 손목)	        손 위치
-                # 10 Right Wrist (오른쪽 손목)	    손 위치
-                # 11 Left Hip (왼쪽 엉덩이)	        하체 위치
-                # 12 Right Hip (오른쪽 엉덩이)	    하체 위치
-                # 13 Left Knee (왼쪽 무릎)	        다리 관절
-                # 14 Right Knee (오른쪽 무릎)	    다리 관절
-                # 15 Left Ankle (왼쪽 발목)	        발 위치
-                # 16 Right Ankle (오른쪽 발목)	    발 위치
-                """
-                
-                # 저장소 만들기
-                pose_data = []
-                keypoints_list = []
-
-                for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):
-                    # 신뢰도 50% 이상인 경우만 포함   
-                    if score > 0.5:
-                        keypoints_list.append({
-                            "id": i,                    # 관절 ID (COCO 데이터셋 기준)
-                            "x": int(kp[0]),            # x 좌표
-                            "y": int(kp[1]),            # y 좌표
-                            "confidence": float(score)  # 신뢰도 값 (0~1)
-                        })
-
-                        # Keypoints 시각화
-                        cv2.circle(frame, (int(kp[0]), int(kp[1])), 5, (0, 255, 0), -1)
-
-                # 사람 단위로 데이터 저장
-                pose_data.append({
-                    "person_id": 1,                     # 감지된 사람 ID
-                    "keypoints": keypoints_list         # 관절 리스트
-                })
+            # 4. 모델 활용하여 이미지 감지 (초기화 때 받은 공유 모델 사용)
+            pose_frame = detect(frame)
+
+            # 5. 감지된 좌표 값 화면에 표시 (감지된 모든 사람)
+            pose_frame.draw(frame)
 
             # 최종 데이터 구조 (JSON 형태로 저장 : FastAPI Data Default)
-            pose_response = {
-                "status": "success",  # 요청 성공 여부
-                "pose": pose_data,  # 감지된 포즈 데이터
-                "timestamp": datetime.utcnow().isoformat()  # 타임스탬프
-            }
+            pose_response = pose_frame.to_response()
 
             print(pose_response)
 
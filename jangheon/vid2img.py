@@ -1,68 +1,70 @@
 import cv2
 import os
-import tkinter as tk
-from tkinter import filedialog
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.frame_extractor import extract_frames
 
 def select_video_file():
+    from tkinter import filedialog
     file_path = filedialog.askopenfilename(title="Select Video File", filetypes=[("MP4 files", "*.mp4"), ("All files", "*.*")])
     return file_path
 
 def select_save_folder():
+    from tkinter import filedialog
     folder_path = filedialog.askdirectory(title="Select Save Folder")
     return folder_path
 
-# Tkinter GUI 숨기기
-root = tk.Tk()
-root.withdraw()
+if __name__ == "__main__":
+    # 인자로 경로를 주면 대화상자 없이 실행 (예: python vid2img.py video.mp4 ./img_output)
+    parser = argparse.ArgumentParser(description="Video → Image frame extraction")
+    parser.add_argument("video", nargs="?", help="video file path")
+    parser.add_argument("save_folder", nargs="?", help="save folder path")
+    parser.add_argument("--seconds", type=float, default=1.0, help="save one frame every N seconds")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
 
-# 비디오 파일과 저장 폴더 선택
-video_filepath = select_video_file()
-save_folder = select_save_folder()
+    video_filepath, save_folder = args.video, args.save_folder
 
-if not video_filepath or not save_folder:
-    print("No file or folder selected.")
-    exit(0)
+    if not video_filepath or not save_folder:
+        # Tkinter GUI 숨기기
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
 
-video = cv2.VideoCapture(video_filepath)
+        # 비디오 파일과 저장 폴더 선택
+        video_filepath = video_filepath or select_video_file()
+        save_folder = save_folder or select_save_folder()
 
-if not video.isOpened():
-    print("Could not Open :", video_filepath)
-    exit(0)
+    if not video_filepath or not save_folder:
+        print("No file or folder selected.")
+        exit(0)
 
-# 비디오 정보 출력
-length = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
-width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
-height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
-fps = video.get(cv2.CAP_PROP_FPS)
+    video = cv2.VideoCapture(video_filepath)
 
-print("length :", length)
-print("width :", width)
-print("height :", height)
-print("fps :", fps)
+    if not video.isOpened():
+        print("Could not Open :", video_filepath)
+        exit(0)
 
-# 저장할 디렉토리 설정
-video_name = os.path.splitext(os.path.basename(video_filepath))[0]
-save_path = os.path.join(save_folder, video_name)
+    # 비디오 정보 출력
+    length = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = video.get(cv2.CAP_PROP_FPS)
+    video.release()
 
-try:
-    if not os.path.exists(save_path):
-        os.makedirs(save_path)
-except OSError:
-    print('Error: Creating directory.', save_path)
-    exit(0)
+    print("length :", length)
+    print("width :", width)
+    print("height :", height)
+    print("fps :", fps)
 
-count = 0
+    # 저장할 디렉토리 설정
+    video_name = os.path.splitext(os.path.basename(video_filepath))[0]
+    save_path = os.path.join(save_folder, video_name)
 
-while video.isOpened():
-    ret, image = video.read()
-    if not ret:
-        break
-    
-    if int(video.get(1)) % fps == 0:  # 1초마다 프레임 저장
-        frame_filename = os.path.join(save_path, f"frame{count}.jpg")
-        cv2.imwrite(frame_filename, image)
-        print('Saved frame number :', int(video.get(1)))
-        count += 1
+    # 1초마다 프레임 저장 (저장하지 않는 프레임은 grab()으로 건너뜀, 구간별 병렬 처리)
+    saved = extract_frames(video_filepath, save_path, seconds=args.seconds, workers=args.workers)
 
-video.release()
-print("Frame extraction completed.")
+    print('Saved frames :', saved)
+    print("Frame extraction completed.")
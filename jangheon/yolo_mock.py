@@ -1,13 +1,16 @@
-import json
 import cv2
 import sys
 import os
 from datetime import datetime, time
-from ultralytics import YOLO
 import time as tm
 
-# 모델 불러오기
-model = YOLO("./tests/KHS/models/yolov8n-pose.pt")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.model_registry import get_model
+from perfectpose.pose_frame import PoseFrame
+from perfectpose.pose_stream import PoseStreamWriter, convert_jsonl_to_json
+
+# 모델 불러오기 (공유 모델 저장소에서 불러온 뒤 예열)
+model = get_model("./tests/KHS/models/yolov8n-pose.pt", task="pose")
 
 # 웹캠 열기
 vcap = cv2.VideoCapture(0)  # 기본 웹캠
@@ -18,7 +21,10 @@ if not vcap.isOpened():
 
 # JSON 파일 및 이미지 저장 폴더 설정
 json_file = "pose_data.json"
-data_list = []  # JSON 데이터 리스트
+jsonl_file = "pose_data.jsonl"  # 프레임 단위로 이어 쓰는 JSONL 파일
+if os.path.exists(jsonl_file):
+    os.remove(jsonl_file)       # 이전 세션 데이터 초기화
+writer = PoseStreamWriter(jsonl_file, fsync_every=30, fsync_interval=1.0)
 img_output_dir = "tests/LJH/img_output"
 os.makedirs(img_output_dir, exist_ok=True)
 
@@ -44,27 +50,9 @@ while vcap.isOpened():
     # 모델 실행
     results = model(frame)
     
-    pose_data = []
-    for result in results:
-        keypoints = result.keypoints.xy.cpu().numpy()
-        scores = result.keypoints.conf.cpu().numpy()
-
-        keypoints_list = []
-        for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):
-            if score > 0.5:  # 신뢰도 50% 이상만 포함
-                keypoints_list.append({
-                    "id": i,
-                    "x": int(kp[0]),
-                    "y": int(kp[1]),
-                    "confidence": float(score)
-                })
-                # 감지된 좌표를 화면에 표시
-                cv2.circle(frame, (int(kp[0]), int(kp[1])), 5, (0, 255, 0), -1)
-
-        pose_data.append({
-            "person_id": 1,
-            "keypoints": keypoints_list
-        })
+    # 감지된 모든 사람의 키포인트를 한 번에 CPU로 복사 후 화면에 표시
+    pose_frame = PoseFrame.from_result(results[0])
+    pose_frame.draw(frame)
     
     # 이미지 파일명 생성
     img_filename = f"frame_{frame_count:05d}.jpg"
@@ -73,14 +61,12 @@ while vcap.isOpened():
     # JSON 데이터 추가
     pose_response = {
         "image_name": img_filename,
-        "timestamp": datetime.utcnow().isoformat(),
-        "pose": pose_data
+        "timestamp": pose_frame.timestamp.isoformat(),
+        "pose": pose_frame.to_pose_data()
     }
-    data_list.append(pose_response)
-    
-    # JSON 파일 저장
-    with open(json_file, "w", encoding="utf-8") as f:
-        json.dump(data_list, f, ensure_ascii=False, indent=2)
+
+    # JSONL 파일에 현재 프레임만 추가 (전체 파일 재작성 없음)
+    writer.write(pose_response)
     
     # 원본 이미지 저장 (좌표가 없는 상태)
     cv2.imwrite(img_filepath, original_frame)
@@ -100,3 +86,8 @@ while vcap.isOpened():
 # 웹캠 종료 및 창 닫기
 vcap.release()
 cv2.destroyAllWindows()
+
+# JSONL 저장 종료 후 기존 JSON 배열 형식으로 변환
+writer.close()
+convert_jsonl_to_json(jsonl_file, json_file, indent=2)
+print(f"{writer.count}개 프레임 저장 완료: {json_file}")
@@ -0,0 +1,44 @@
+"""
+Perfect Pose 공통 모듈 패키지
+
+- 각 작업 폴더(hyeongseob, jangheon, sanggyeom)에서 함께 사용하는 기능을 모아둔 패키지
+- `import perfectpose`는 하위 모듈을 불러오지 않음 : perfectpose.PoseFrame처럼 처음 접근할 때 해당 모듈만 import
+"""
+import importlib
+
+# 패키지에서 바로 사용할 수 있는 이름 : 이름 -> 모듈
+_LAZY_ATTRS = {
+    "create_backend": "perfectpose.backends",
+    "select_backend": "perfectpose.backends",
+    "MicroBatcher": "perfectpose.batching",
+    "extract_frames": "perfectpose.frame_extractor",
+    "GuidePoseLibrary": "perfectpose.guide_library",
+    "list_images": "perfectpose.image_io",
+    "iter_image_batches": "perfectpose.image_io",
+    "get_model": "perfectpose.model_registry",
+    "PosePipeline": "perfectpose.pipeline",
+    "encode_frame": "perfectpose.pose_codec",
+    "decode_frame": "perfectpose.pose_codec",
+    "pose_signature": "perfectpose.pose_features",
+    "summarize_pose": "perfectpose.pose_features",
+    "PoseFrame": "perfectpose.pose_frame",
+    "PoseStreamWriter": "perfectpose.pose_stream",
+    "score_matrix": "perfectpose.scoring",
+    "SkipFrameDetector": "perfectpose.smoothing",
+    "PoseTracker": "perfectpose.tracker",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'perfectpose' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,177 @@
+import abc
+import os
+import time
+
+import cv2
+import numpy as np
+
+from perfectpose.model_registry import get_model
+from perfectpose.pose_frame import PoseFrame
+
+# 지연 시간 측정용 기본 프레임 (사람이 있는 샘플 이미지, 없으면 임의 노이즈)
+SAMPLE_FRAME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "frame_0.jpg")
+
+
+class PoseBackend(abc.ABC):
+    """
+    📌 포즈 추정 백엔드 공통 인터페이스
+    - infer(frames): 프레임 리스트 → 프레임별 PoseFrame 리스트 (모든 백엔드가 같은 (P, 17, 3) 형식)
+    - 실시간 루프(PoseEstimator.real_time_video_detecting)와 가이드 제작(capture_image_detecting,
+      sanggyeom/01_pose_detecitons.py)이 모두 이 인터페이스로 추론
+    - accuracy_rank: 정확도 순위 (클수록 정확), select_backend에서 사용
+    - latency_ms: measure_latency()로 측정한 프레임당 지연 시간
+    """
+
+    name = "base"
+    accuracy_rank = 0
+
+    def __init__(self):
+        self.latency_ms = None
+
+    @abc.abstractmethod
+    def infer(self, frames):
+        """
+        프레임(BGR) 리스트 → 프레임별 PoseFrame 리스트
+        """
+
+    def __call__(self, frame):
+        # 프레임 한 장 → PoseFrame (PosePipeline 등 프레임 단위 호출용)
+        return self.infer([frame])[0]
+
+    def measure_latency(self, frame=None, runs=5, warmup_runs=1):
+        """
+        📌 현재 CPU/GPU에서 프레임당 지연 시간(ms) 측정 (중앙값)
+        """
+        frame = load_sample_frame() if frame is None else frame
+        for _ in range(warmup_runs):
+            self.infer([frame])
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.infer([frame])
+            timings.append((time.perf_counter() - start) * 1000)
+        self.latency_ms = float(np.median(timings))
+        return self.latency_ms
+
+
+class YoloPoseBackend(PoseBackend):
+    """
+    YOLO-Pose 백엔드 (한 번의 추론으로 감지 + 관절 추정, 실시간용)
+    """
+
+    name = "yolo"
+    accuracy_rank = 1
+
+    def __init__(self, weights="yolov8n-pose.pt", device="cpu", imgsz=640):
+        super().__init__()
+        self.weights = weights
+        self.device = device
+        self.imgsz = imgsz
+
+    @property
+    def model(self):
+        # 모델 저장소의 공유 YOLO 모델 (imgsz를 바꿔 호출하는 ROI 추론은 instance를 달리한 전용 모델 사용)
+        return get_model(self.weights, task="pose", device=self.device, imgsz=self.imgsz)
+
+    def infer(self, frames):
+        results = self.model.predict(list(frames), imgsz=self.imgsz, device=self.device, verbose=False)
+        return PoseFrame.from_results(results)
+
+
+class ViTPoseBackend(PoseBackend):
+    """
+    Top-down ViTPose 백엔드 (사람 감지 후 사람별 관절 추정, 가이드 제작 등 정확도 우선 작업용)
+    """
+
+    name = "vitpose"
+    accuracy_rank = 2
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        from perfectpose.vitpose import ViTPoseEstimator
+
+        self.estimator = ViTPoseEstimator(**kwargs)
+
+    def infer(self, frames):
+        return self.estimator.infer(frames)
+
+
+# 백엔드 이름 -> 클래스
+BACKENDS = {
+    YoloPoseBackend.name: YoloPoseBackend,
+    ViTPoseBackend.name: ViTPoseBackend,
+}
+
+
+def load_sample_frame():
+    frame = cv2.imread(SAMPLE_FRAME)
+    if frame is None:
+        frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    return frame
+
+
+def create_backend(name, **kwargs):
+    """
+    이름으로 백엔드 생성 (예: create_backend("yolo", weights="yolov8s-pose.pt"))
+    - 이미 만든 PoseBackend를 넘기면 그대로 반환
+    """
+    if isinstance(name, PoseBackend):
+        return name
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+def profile_backends(backends, frame=None, runs=5):
+    """
+    📌 백엔드별 지연 시간 측정 (시작 시 한 번 실행)
+    - 필요한 라이브러리가 없는 백엔드는 건너뜀 (지연 시간 inf)
+    - 출력: {백엔드 이름: 프레임당 지연 시간 ms}
+    """
+    frame = load_sample_frame() if frame is None else frame
+    profile = {}
+    for backend in backends:
+        try:
+            backend.measure_latency(frame, runs=runs)
+        except ImportError as e:
+            backend.latency_ms = float("inf")
+            print(f"{backend.name:<10} 건너뜀: {e}")
+        else:
+            print(f"{backend.name:<10} {backend.latency_ms:8.1f} ms/frame")
+        profile[backend.name] = backend.latency_ms
+    return profile
+
+
+def select_backend(budget_ms, backends=None, frame=None, runs=5):
+    """
+    📌 지연 시간 예산 안에서 가장 정확한 백엔드 선택
+    - 측정값이 없는 백엔드는 먼저 profile_backends로 측정
+    - 예산을 만족하는 백엔드가 없으면 가장 빠른 백엔드 반환
+    - backends: PoseBackend 또는 백엔드 이름 리스트 (기본값: 등록된 전체 백엔드)
+    """
+    backends = [create_backend(backend) for backend in (backends if backends is not None else BACKENDS)]
+    unmeasured = [backend for backend in backends if backend.latency_ms is None]
+    if unmeasured:
+        profile_backends(unmeasured, frame=frame, runs=runs)
+
+    backends = [backend for backend in backends if backend.latency_ms != float("inf")]
+    if not backends:
+        raise RuntimeError("사용 가능한 포즈 백엔드가 없습니다.")
+
+    within_budget = [backend for backend in backends if backend.latency_ms <= budget_ms]
+    if not within_budget:
+        return min(backends, key=lambda backend: backend.latency_ms)
+    return max(within_budget, key=lambda backend: (backend.accuracy_rank, -backend.latency_ms))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="포즈 백엔드 지연 시간 측정 및 선택")
+    parser.add_argument("--budget", type=float, default=33.0, help="프레임당 지연 시간 예산 (ms, 기본값: 30 FPS)")
+    parser.add_argument("--runs", type=int, default=5, help="백엔드별 측정 횟수")
+    args = parser.parse_args()
+
+    selected = select_backend(args.budget, runs=args.runs)
+    print(f"선택된 백엔드: {selected.name} ({selected.latency_ms:.1f} ms/frame, 예산 {args.budget} ms)")
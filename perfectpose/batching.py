@@ -0,0 +1,127 @@
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# 배처 종료 신호
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    📌 여러 호출자(API 요청, 카메라 루프 등)의 프레임을 모아 한 번에 추론하는 스케줄러
+    - submit(item)으로 프레임을 넣으면 Future 반환, 결과가 나오면 Future에 전달
+    - 배치가 max_batch개로 가득 차거나 첫 프레임 이후 max_wait_ms가 지나면 infer_batch_fn(items) 실행
+    - infer_batch_fn: 입력 리스트 → 같은 순서의 결과 리스트 (예: YOLO predict에 이미지 리스트 전달)
+    - 실제로 처리된 배치 크기 통계는 stats()로 확인
+    """
+
+    def __init__(self, infer_batch_fn, max_batch=8, max_wait_ms=5.0, name="micro-batcher"):
+        self.infer_batch_fn = infer_batch_fn
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.batch_sizes = collections.Counter()
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """
+        프레임 하나를 배치 대기열에 추가하고 Future 반환
+        """
+        if self._closed:
+            raise RuntimeError("이미 종료된 배처입니다.")
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """
+        프레임 하나를 추론하고 결과가 나올 때까지 대기 (동기 호출용)
+        """
+        return self.submit(item).result(timeout)
+
+    def _collect(self):
+        # 첫 프레임은 계속 대기, 이후에는 마감 시간까지 max_batch개가 될 때까지 수집
+        first = self._queue.get()
+        if first is _STOP:
+            return None, True
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self, batch):
+        # 이미 취소된 요청은 제외
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            results = self.infer_batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"배치 결과 개수가 맞지 않습니다: 입력 {len(batch)}개, 결과 {len(results)}개")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+            self.batches += 1
+            self.items += len(batch)
+            self.batch_sizes[len(batch)] += 1
+
+    def _loop(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if batch:
+                self._run(batch)
+
+    def stats(self):
+        """
+        📌 배치 처리 통계
+        - mean_batch_size: 실제 평균 배치 크기, batch_sizes: {배치 크기: 횟수}
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "pending": self._queue.qsize(),
+        }
+
+    def close(self, timeout=None):
+        """
+        대기 중인 프레임을 모두 처리한 뒤 배치 스레드 종료
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
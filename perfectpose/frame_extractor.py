@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+
+def frame_filename(index, prefix="frame", digits=6, ext=".jpg"):
+    """
+    원본 프레임 번호 기준 파일명 생성 (작업 분할과 상관없이 항상 같은 이름)
+    """
+    return f"{prefix}_{index:0{digits}d}{ext}" if digits else f"{prefix}_{index}{ext}"
+
+
+def _open_at(video_path, start):
+    """
+    비디오를 열고 start 프레임 위치로 이동
+    - 코덱에 따라 키프레임 단위로만 이동되는 경우가 있어 실제 위치를 확인
+    - 목표보다 앞에 멈추면 grab()으로 남은 프레임을 건너뛰고, 뒤로 넘어가면 처음부터 건너뜀
+    """
+    vcap = cv2.VideoCapture(video_path)
+    if not vcap.isOpened():
+        raise IOError(f"비디오 파일 오류: {video_path}")
+    if start <= 0:
+        return vcap
+
+    vcap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    position = int(vcap.get(cv2.CAP_PROP_POS_FRAMES))
+    if position > start:
+        vcap.release()
+        vcap = cv2.VideoCapture(video_path)
+        position = 0
+
+    while position < start and vcap.grab():
+        position += 1
+    return vcap
+
+
+def _seek_to(vcap, video_path, current, target):
+    """
+    현재 위치(current)에서 target 프레임으로 이동 : (vcap, 실제 위치, 직접 이동 가능 여부) 반환
+    - 이동 후 실제 위치를 확인하여 목표보다 앞(키프레임)에 멈추면 grab()으로 남은 프레임을 건너뜀
+    - 목표를 넘어가거나 현재 위치보다 뒤로 가면 current 위치로 다시 열고 False 반환 (이후 순차 grab()으로 처리)
+    """
+    vcap.set(cv2.CAP_PROP_POS_FRAMES, target)
+    position = int(vcap.get(cv2.CAP_PROP_POS_FRAMES))
+    if current <= position <= target:
+        while position < target and vcap.grab():
+            position += 1
+        return vcap, position, True
+
+    vcap.release()
+    return _open_at(video_path, current), current, False
+
+
+def _extract_segment(video_path, output_dir, start, end, every, prefix, digits, ext, use_seek):
+    """
+    📌 [start, end) 구간에서 every 프레임마다 한 장씩 저장 (프로세스 풀 작업 단위)
+    - 저장하지 않는 프레임은 grab()만 호출하여 색 변환/복사 비용 생략
+    - use_seek=True면 저장할 프레임으로 바로 이동 (간격이 큰 경우 유리), 실제 이동 위치를 확인하여
+      정확히 이동되지 않는 비디오는 순차 grab()으로 전환
+    - end가 None이면 비디오 끝까지 처리
+    """
+    vcap = _open_at(video_path, start)
+    saved = 0
+    index = start
+
+    try:
+        while end is None or index < end:
+            if index % every == 0:
+                ret, frame = vcap.read()
+                if not ret:
+                    break
+                cv2.imwrite(os.path.join(output_dir, frame_filename(index, prefix, digits, ext)), frame)
+                saved += 1
+                index += 1
+            elif use_seek:
+                # 다음 저장 프레임으로 이동 (구간 끝을 넘으면 반복문 종료)
+                target = index + every - index % every
+                vcap, position, use_seek = _seek_to(vcap, video_path, index, target)
+                if use_seek and position < target:
+                    break                                       # 비디오 끝
+                index = position
+            else:
+                if not vcap.grab():
+                    break
+                index += 1
+    finally:
+        vcap.release()
+
+    return saved
+
+
+def extract_frames(video_path, output_dir, every=None, seconds=None, workers=None,
+                   prefix="frame", digits=6, ext=".jpg", use_seek=False):
+    """
+    📌 화면 출력 없이 비디오에서 일정 간격으로 프레임을 추출하여 저장
+    - every: N 프레임마다 한 장 저장 (지정하지 않으면 seconds 또는 1초 간격)
+    - workers: 비디오를 시간 구간으로 나누어 처리할 프로세스 수 (기본값: CPU 수)
+    - 저장 파일명은 원본 프레임 번호 기준 (예: frame_000024.jpg)
+    - 출력: 저장한 프레임 수
+    """
+    vcap = cv2.VideoCapture(video_path)
+    if not vcap.isOpened():
+        raise IOError(f"비디오 파일 오류: {video_path}")
+    fps = vcap.get(cv2.CAP_PROP_FPS) or 30.0
+    total = int(vcap.get(cv2.CAP_PROP_FRAME_COUNT))
+    vcap.release()
+
+    if every is None:
+        every = max(int(round(fps * (seconds or 1.0))), 1)
+    os.makedirs(output_dir, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    # 프레임 수를 알 수 없거나 짧은 비디오는 단일 구간으로 처리
+    if total <= 0 or workers <= 1 or total < every * workers:
+        return _extract_segment(video_path, output_dir, 0, None, every, prefix, digits, ext, use_seek)
+
+    # 구간 경계는 저장 간격(every)의 배수로 맞춤, 마지막 구간은 비디오 끝까지
+    step = -(-total // (workers * every)) * every
+    bounds = [(start, start + step) for start in range(0, total, step)]
+    bounds[-1] = (bounds[-1][0], None)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_extract_segment, video_path, output_dir, start, end, every, prefix, digits, ext, use_seek)
+            for start, end in bounds
+        ]
+        return sum(future.result() for future in futures)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="비디오 프레임 추출 (화면 출력 없음)")
+    parser.add_argument("video", help="입력 비디오 파일")
+    parser.add_argument("output_dir", help="프레임 저장 폴더")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--every", type=int, help="N 프레임마다 한 장 저장")
+    group.add_argument("--seconds", type=float, help="N초마다 한 장 저장 (기본값: 1초)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--prefix", default="frame", help="저장 파일명 접두사")
+    parser.add_argument("--seek", action="store_true", help="저장할 프레임으로 직접 이동 (간격이 클 때 사용)")
+    args = parser.parse_args(argv)
+
+    saved = extract_frames(args.video, args.output_dir, every=args.every, seconds=args.seconds,
+                           workers=args.workers, prefix=args.prefix, use_seek=args.seek)
+    print(f"{saved}개 프레임 저장 완료: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+import numpy as np
+
+from perfectpose.scoring import bone_directions, keypoints_to_array, score_directions
+
+
+def _strip_npy(path):
+    """
+    경로 끝의 .npy 확장자 제거
+    """
+    return path[:-4] if path.endswith(".npy") else path
+
+
+class GuidePoseLibrary:
+    """
+    📌 가이드 포즈 라이브러리
+    - 가이드 포즈의 관절 방향(단위 벡터)을 한 번만 계산하여 보관
+    - .npy 파일로 저장하고 메모리 매핑(mmap)으로 불러와 시작 시 JSON 파싱 없음
+    - 실시간 포즈와 가장 가까운 가이드 포즈 k개를 벡터 연산으로 검색
+    """
+
+    def __init__(self, directions, names):
+        self.directions = directions        # (M, B, 2) 관절 단위 방향 (무효 관절은 (0, 0))
+        self.names = names                  # (M,) 가이드 포즈 이름
+
+    def __len__(self):
+        return len(self.directions)
+
+    @classmethod
+    def from_poses(cls, guide_poses, names=None, conf_threshold=0.0):
+        """
+        가이드 포즈 목록으로 라이브러리 생성
+        - guide_poses: 키포인트 목록({"id","x","y"}) 리스트 또는 (M, 17, 3) 배열
+        """
+        if not isinstance(guide_poses, np.ndarray):
+            guide_poses = np.array([keypoints_to_array(kps) for kps in guide_poses], dtype=np.float32).reshape(-1, 17, 3)
+        if names is None:
+            names = [str(i) for i in range(len(guide_poses))]
+        return cls(bone_directions(guide_poses, conf_threshold), np.asarray(names, dtype=str))
+
+    @classmethod
+    def from_json(cls, json_path):
+        """
+        가이드 포즈 JSON 파일로 라이브러리 생성 (라이브러리 빌드 시 1회만 사용)
+        - 형식: [{"image_name": ..., "pose": [{"person_id": 1, "keypoints": [...]}]}, ...]
+        """
+        with open(json_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        poses, names = [], []
+        for i, item in enumerate(data):
+            if not item.get("pose"):
+                continue
+            poses.append(item["pose"][0]["keypoints"])
+            names.append(item.get("image_name", item.get("image_id", str(i))))
+        return cls.from_poses(poses, names)
+
+    def save(self, path):
+        """
+        라이브러리 저장
+        - path.npy : 관절 방향 배열 (float32, mmap 가능)
+        - path.names.npy : 가이드 포즈 이름
+        """
+        path = _strip_npy(path)
+        np.save(path + ".npy", np.ascontiguousarray(self.directions, dtype=np.float32))
+        np.save(path + ".names.npy", self.names)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        저장된 라이브러리 불러오기 (mmap=True면 실제 접근 시점에만 디스크에서 읽음)
+        """
+        path = _strip_npy(path)
+        directions = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        names = np.load(path + ".names.npy")
+        return cls(directions, names)
+
+    def scores(self, user_poses, conf_threshold=0.5):
+        """
+        사용자 포즈 (N, 17, 3) 와 모든 가이드 포즈의 점수 행렬 (N, M) 계산
+        """
+        return score_directions(bone_directions(user_poses, conf_threshold), self.directions)
+
+    def nearest(self, user_pose, k=5, conf_threshold=0.5):
+        """
+        📌 실시간 포즈와 가장 가까운 가이드 포즈 k개 검색
+        - 입력: (17, 3) 사용자 포즈 배열
+        - 출력: [(가이드 인덱스, 가이드 이름, 점수), ...] (점수 내림차순)
+        """
+        scores = self.scores(user_pose, conf_threshold)[0]
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+
+        # 상위 k개만 부분 정렬 후 점수 순으로 정렬
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), str(self.names[i]), float(scores[i])) for i in top]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="가이드 포즈 JSON → 라이브러리(.npy) 변환")
+    parser.add_argument("json_path", help="가이드 포즈 JSON 파일")
+    parser.add_argument("output_path", help="저장할 라이브러리 경로 (확장자 제외)")
+    args = parser.parse_args()
+
+    library = GuidePoseLibrary.from_json(args.json_path)
+    library.save(args.output_path)
+    print(f"가이드 포즈 {len(library)}개 저장 완료: {args.output_path}.npy")
@@ -0,0 +1,55 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+# 지원하는 이미지 확장자
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def list_images(folder):
+    """
+    폴더 안의 이미지 파일 경로 목록 반환 (파일명 순 정렬)
+    """
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.lower().endswith(IMAGE_EXTENSIONS)]
+
+
+def iter_image_batches(image_paths, batch_size=8, workers=4, prefetch=2):
+    """
+    📌 이미지를 스레드 풀에서 미리 읽어 배치 단위로 반환하는 제너레이터
+    - cv2.imread는 GIL을 해제하므로 디코딩이 추론과 동시에 진행됨
+    - 최대 batch_size * prefetch 장까지만 미리 읽어 메모리 사용량 제한
+    - 출력: [(이미지 경로, 프레임), ...] (읽기 실패한 이미지는 제외)
+    """
+    lookahead = max(batch_size * prefetch, 1)
+    paths = iter(image_paths)
+    pending = deque()
+    batch = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            pending.append((path, pool.submit(cv2.imread, path)))
+            if len(pending) >= lookahead:
+                break
+
+        while pending:
+            path, future = pending.popleft()
+
+            # 하나를 꺼낼 때마다 다음 이미지 읽기 예약
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(cv2.imread, next_path)))
+
+            frame = future.result()
+            if frame is None:
+                print(f"이미지를 불러올 수 없습니다: {path}")
+                continue
+
+            batch.append((path, frame))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
@@ -0,0 +1,68 @@
+import os
+import threading
+import numpy as np
+
+# 프로세스 전체에서 공유하는 모델 저장소 : (가중치 경로, task, device, 인스턴스 번호) -> 모델
+_models = {}
+_lock = threading.Lock()
+
+
+def _registry_key(weights, task, device, instance):
+    # 파일 경로는 절대 경로로 통일 (파일이 없으면 ultralytics 자동 다운로드 이름 그대로 사용)
+    path = os.path.abspath(weights) if os.path.exists(weights) else weights
+    return (path, task, str(device), instance)
+
+
+def warm_up(model, device="cpu", imgsz=640, runs=1):
+    """
+    📌 더미 프레임으로 모델 예열 (첫 프레임 지연 제거)
+    """
+    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    for _ in range(runs):
+        model.predict(dummy, imgsz=imgsz, device=device, verbose=False)
+
+
+def get_model(weights, task="pose", device="cpu", warmup_runs=1, imgsz=640, instance=0):
+    """
+    📌 가중치 경로, task, device 기준으로 YOLO 모델을 한 번만 불러와 공유
+    - 처음 요청 시에만 모델을 불러오고 warmup_runs회 예열 추론 실행
+    - 이후 같은 키로 요청하면 이미 불러온 모델을 그대로 반환
+    - instance: 여러 스레드에서 동시에 추론할 때 스레드별로 다른 번호를 주어 별도 모델 사용
+      (YOLO predictor는 스레드 간 공유 시 안전하지 않음)
+    - device는 예열 여부와 상관없이 적용 (.pt는 바로 해당 장치로 이동, device를 넘기지 않는 predict도 같은 장치 사용)
+    """
+    key = _registry_key(weights, task, device, instance)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        # 다른 스레드가 먼저 불러왔는지 다시 확인
+        model = _models.get(key)
+        if model is None:
+            from ultralytics import YOLO
+
+            model = YOLO(weights, task=task)
+            # predict 호출 시 device를 생략해도 등록 키의 장치에서 추론 (ultralytics 기본값은 GPU 자동 선택)
+            model.overrides["device"] = str(device)
+            if str(weights).endswith(".pt"):
+                model.to(device)
+            if warmup_runs:
+                warm_up(model, device=device, imgsz=imgsz, runs=warmup_runs)
+            _models[key] = model
+    return model
+
+
+def loaded_models():
+    """
+    현재 불러온 모델 키 목록 반환
+    """
+    return list(_models)
+
+
+def clear():
+    """
+    불러온 모델 모두 해제
+    """
+    with _lock:
+        _models.clear()
@@ -0,0 +1,220 @@
+import os
+import re
+
+import cv2
+import numpy as np
+
+from perfectpose.image_io import list_images
+from perfectpose.model_registry import get_model
+from perfectpose.pose_frame import PoseFrame
+from perfectpose.tracker import assign, keypoint_oks
+
+# 📌 YOLO-Pose CPU 추론 경로 (ONNX Runtime / OpenVINO)
+# - export_pose_model : PyTorch 가중치(.pt) → ONNX 또는 OpenVINO (기본값: 배치 크기/입력 크기 가변)
+# - quantize_int8     : 촬영한 프레임으로 보정(calibration)한 INT8 정적 양자화 ONNX 생성
+# - check_drift       : PyTorch 모델과 출력 비교 (OKS, 좌표 오차, 사람 수 차이)
+# - 만든 모델은 get_model("yolov8n-pose.onnx") / PoseEstimator("yolov8n-pose_int8.onnx")로 그대로 사용
+#   (ultralytics가 확장자/폴더명으로 ONNX Runtime, OpenVINO 백엔드를 선택)
+# - 기본값(dynamic=True)으로 내보낸 모델만 .pt 대신 바로 사용 가능 : 여러 장 묶음 추론(batch_size=8, MicroBatcher),
+#   다른 입력 크기(RoiPoseDetector의 imgsz=roi_size) 모두 지원
+# - dynamic=False(고정 입력)로 내보낸 모델은 내보낼 때의 batch, imgsz로만 추론 가능 : 프레임 한 장씩,
+#   같은 imgsz로만 호출하는 실시간 루프 전용 (다른 크기로 호출하면 ONNX Runtime/OpenVINO에서 오류)
+
+
+def export_pose_model(weights="yolov8n-pose.pt", format="onnx", imgsz=640, dynamic=True, batch=1, half=False):
+    """
+    📌 YOLO-Pose 모델 내보내기
+    - format: "onnx" 또는 "openvino"
+    - dynamic=True(기본값) 이면 배치 크기와 입력 크기 가변 (기존 .pt 모델 대신 그대로 사용 가능)
+    - dynamic=False 이면 (batch, 3, imgsz, imgsz) 입력 고정 : CPU에서 조금 더 빠르지만
+      같은 batch, imgsz로 호출하는 곳에서만 사용 가능
+    - 출력: 내보낸 모델 경로 (.onnx 파일 또는 *_openvino_model 폴더)
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(weights, task="pose")
+    kwargs = dict(format=format, imgsz=imgsz, dynamic=dynamic, batch=batch, half=half)
+    if format == "onnx":
+        kwargs["simplify"] = True
+    path = model.export(**kwargs)
+    print(f"모델 내보내기 완료: {path}")
+    return path
+
+
+def letterbox(image, imgsz=640, color=(114, 114, 114)):
+    """
+    ultralytics 추론과 같은 방식으로 비율 유지 resize 후 정사각형 패딩
+    """
+    height, width = image.shape[:2]
+    scale = min(imgsz / height, imgsz / width)
+    new_w, new_h = int(round(width * scale)), int(round(height * scale))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, left = (imgsz - new_h) // 2, (imgsz - new_w) // 2
+    return cv2.copyMakeBorder(resized, top, imgsz - new_h - top, left, imgsz - new_w - left,
+                              cv2.BORDER_CONSTANT, value=color)
+
+
+def preprocess(image, imgsz=640):
+    """
+    BGR 이미지 → 모델 입력 (1, 3, imgsz, imgsz) float32 (RGB, 0~1)
+    """
+    image = letterbox(image, imgsz)
+    return np.ascontiguousarray(image[..., ::-1].transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+def _head_nodes(onnx_path):
+    # 마지막 모듈(Pose head)의 노드 이름 목록 : 좌표 복원 연산은 양자화하면 오차가 커서 제외
+    import onnx
+
+    graph = onnx.load(onnx_path).graph
+    indices = [int(m.group(1)) for node in graph.node for m in [re.match(r"/model\.(\d+)/", node.name)] if m]
+    if not indices:
+        return []
+    head = f"/model.{max(indices)}/"
+    return [node.name for node in graph.node if node.name.startswith(head)]
+
+
+def quantize_int8(onnx_path, calibration_dir, output_path=None, imgsz=640, max_images=200, exclude_head=True,
+                  per_channel=False):
+    """
+    📌 INT8 정적 양자화 (ONNX Runtime, QDQ 형식)
+    - calibration_dir: 실제 환경에서 촬영한 프레임 폴더 (예: 캡처 이미지 저장 폴더)
+    - max_images장의 프레임으로 활성값 범위를 보정
+    - exclude_head=True 이면 마지막 Pose head는 FP32로 유지 (관절 좌표 정확도 보존)
+    - 출력: 양자화된 ONNX 경로 (기본값: <이름>_int8.onnx)
+    """
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    image_paths = list_images(calibration_dir)[:max_images]
+    if not image_paths:
+        raise ValueError(f"보정용 이미지가 없습니다: {calibration_dir}")
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        # 보정용 프레임을 한 장씩 읽어 모델 입력으로 전달
+        def __init__(self, input_name):
+            self.input_name = input_name
+            self.paths = iter(image_paths)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(path)
+                if image is not None:
+                    return {self.input_name: preprocess(image, imgsz)}
+            return None
+
+    import onnxruntime
+
+    session = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    output_path = output_path or f"{os.path.splitext(onnx_path)[0]}_int8.onnx"
+    quantize_static(
+        onnx_path,
+        output_path,
+        FrameCalibrationReader(input_name),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel,
+        nodes_to_exclude=_head_nodes(onnx_path) if exclude_head else [],
+    )
+    print(f"INT8 양자화 완료: {output_path} (보정 이미지 {len(image_paths)}장)")
+    return output_path
+
+
+def check_drift(reference, candidate, image_paths, imgsz=640, conf_threshold=0.5):
+    """
+    📌 두 모델(예: PyTorch vs ONNX INT8)의 포즈 출력 차이 측정
+    - 이미지마다 사람을 OKS 기준으로 1:1 매칭한 뒤 비교
+    - 기준 모델에서 보이는데 비교 모델에서 사라진 관절은 0점, 매칭되지 않은 사람(누락/추가)은 OKS 0으로 평균에 포함
+    - 출력: {"images", "mean_oks", "mean_pixel_error", "count_mismatch", "unmatched", "missing_keypoints"}
+    """
+    reference_model = get_model(reference, task="pose", warmup_runs=0, imgsz=imgsz)
+    candidate_model = get_model(candidate, task="pose", warmup_runs=0, imgsz=imgsz)
+
+    oks_values, pixel_errors = [], []
+    count_mismatch = unmatched = missing_keypoints = images = 0
+    for path in image_paths:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        images += 1
+        expected = PoseFrame.from_result(reference_model.predict(image, imgsz=imgsz, verbose=False)[0])
+        actual = PoseFrame.from_result(candidate_model.predict(image, imgsz=imgsz, verbose=False)[0])
+        count_mismatch += len(expected) != len(actual)
+        if not len(expected) or not len(actual):
+            unmatched += max(len(expected), len(actual))
+            oks_values.extend([0.0] * max(len(expected), len(actual)))
+            continue
+
+        oks = keypoint_oks(expected.keypoints, actual.keypoints, conf_threshold, penalize_missing=True)
+        rows, cols = assign(1.0 - oks)
+        missed = max(len(expected), len(actual)) - len(rows)
+        unmatched += missed
+        oks_values.extend(oks[rows, cols].tolist() + [0.0] * missed)
+
+        # 양쪽 모두 보이는 관절의 좌표 오차 (픽셀), 기준 모델에서만 보이는 관절 수
+        a, b = expected.keypoints[rows], actual.keypoints[cols]
+        visible = (a[..., 2] > conf_threshold) & (b[..., 2] > conf_threshold)
+        missing_keypoints += int(np.sum((a[..., 2] > conf_threshold) & ~visible))
+        pixel_errors.extend(np.linalg.norm(a[..., :2] - b[..., :2], axis=-1)[visible].tolist())
+
+    return {
+        "images": images,
+        "mean_oks": float(np.mean(oks_values)) if oks_values else None,
+        "mean_pixel_error": float(np.mean(pixel_errors)) if pixel_errors else None,
+        "count_mismatch": count_mismatch,
+        "unmatched": unmatched,
+        "missing_keypoints": missing_keypoints,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="YOLO-Pose ONNX Runtime / OpenVINO 변환 및 검증")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="PyTorch 가중치 → ONNX / OpenVINO")
+    export.add_argument("weights", nargs="?", default="yolov8n-pose.pt")
+    export.add_argument("--format", choices=["onnx", "openvino"], default="onnx")
+    export.add_argument("--imgsz", type=int, default=640)
+    export.add_argument("--static", action="store_true", help="배치 크기/입력 크기 고정 (--batch, --imgsz로만 추론 가능)")
+    export.add_argument("--batch", type=int, default=1, help="고정 배치 크기 (--static 사용 시)")
+
+    quantize = commands.add_parser("quantize", help="ONNX → INT8 정적 양자화")
+    quantize.add_argument("onnx_path")
+    quantize.add_argument("calibration_dir", help="보정용 프레임 폴더")
+    quantize.add_argument("--output", default=None)
+    quantize.add_argument("--imgsz", type=int, default=640)
+    quantize.add_argument("--max-images", type=int, default=200)
+    quantize.add_argument("--include-head", action="store_true", help="Pose head까지 양자화")
+    quantize.add_argument("--per-channel", action="store_true")
+
+    check = commands.add_parser("check", help="기준 모델 대비 출력 차이 측정")
+    check.add_argument("reference", help="기준 모델 (예: yolov8n-pose.pt)")
+    check.add_argument("candidate", help="비교 모델 (예: yolov8n-pose_int8.onnx)")
+    check.add_argument("image_dir", help="비교할 이미지 폴더")
+    check.add_argument("--imgsz", type=int, default=640)
+    check.add_argument("--min-oks", type=float, default=0.9, help="평균 OKS(누락된 사람/관절은 0점)가 이보다 낮으면 exit code 1")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_pose_model(args.weights, format=args.format, imgsz=args.imgsz, dynamic=not args.static, batch=args.batch)
+    elif args.command == "quantize":
+        quantize_int8(args.onnx_path, args.calibration_dir, output_path=args.output, imgsz=args.imgsz,
+                      max_images=args.max_images, exclude_head=not args.include_head, per_channel=args.per_channel)
+    else:
+        report = check_drift(args.reference, args.candidate, list_images(args.image_dir), imgsz=args.imgsz)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        if report["mean_oks"] is None or report["mean_oks"] < args.min_oks:
+            print(f"❌ 평균 OKS가 기준({args.min_oks})보다 낮습니다.")
+            sys.exit(1)
+        print("✅ 출력 차이 허용 범위 이내")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+
+# 파이프라인 종료 신호
+_STOP = object()
+
+
+class LatestQueue(queue.Queue):
+    """
+    📌 크기 제한 큐 (가득 차면 가장 오래된 항목을 버리고 최신 항목 유지)
+    - 처리 속도가 느려져도 대기 중인 프레임이 쌓이지 않아 지연 시간이 일정하게 유지됨
+    """
+
+    def __init__(self, maxsize=1):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put_latest(self, item):
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class PosePipeline:
+    """
+    📌 캡처 → 추론 → 출력 3단계 파이프라인
+    - 캡처 스레드: read_fn()으로 프레임을 읽어 캡처 큐에 저장
+    - 추론 스레드: 캡처 큐의 최신 프레임으로 infer_fn(frame) 실행
+    - 출력 단계: run()을 호출한 스레드에서 render_fn(frame, result) 실행 (cv2.imshow는 메인 스레드 권장)
+    - 단계 사이는 크기 제한 큐로 연결되며 "최신 프레임 우선" 정책으로 오래된 프레임은 버림
+    - 캡처/추론 스레드에서 발생한 예외는 error에 저장되어 results() / run()에서 다시 발생
+    """
+
+    def __init__(self, read_fn, infer_fn, render_fn, queue_size=1):
+        self.read_fn = read_fn              # () -> (ret, frame)
+        self.infer_fn = infer_fn            # (frame) -> result
+        self.render_fn = render_fn          # (frame, result) -> False 반환 시 종료
+        self.capture_queue = LatestQueue(queue_size)
+        self.result_queue = LatestQueue(queue_size)
+        self.frame_count = 0
+        self.error = None                   # 캡처/추론 스레드에서 발생한 첫 예외
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def _capture_loop(self):
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.read_fn()
+                if not ret:
+                    print("웹캠 프레임을 가져올 수 없습니다.")
+                    break
+                self.frame_count += 1
+                self.capture_queue.put_latest((time.monotonic(), frame))
+        except Exception as e:
+            self._set_error(e)
+        finally:
+            self.capture_queue.put_latest(_STOP)
+
+    def _inference_loop(self):
+        try:
+            while not self._stop_event.is_set():
+                item = self.capture_queue.get()
+                if item is _STOP:
+                    break
+                captured_at, frame = item
+                result = self.infer_fn(frame)
+                self.result_queue.put_latest((captured_at, frame, result))
+        except Exception as e:
+            self._set_error(e)
+        finally:
+            self.result_queue.put_latest(_STOP)
+
+    def _set_error(self, error):
+        # 작업 스레드 예외 저장 (먼저 발생한 예외 유지)
+        if self.error is None:
+            self.error = error
+
+    def start(self):
+        self.error = None
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="pose-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="pose-inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def results(self):
+        """
+        추론 결과를 (캡처 시각, 프레임, 결과) 형태로 하나씩 반환하는 제너레이터
+        - 캡처/추론 스레드가 예외로 종료되었으면 해당 예외 발생
+        """
+        while True:
+            item = self.result_queue.get()
+            if item is _STOP:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield item
+
+    def run(self):
+        """
+        파이프라인을 시작하고 출력 단계를 현재 스레드에서 실행
+        - 캡처/추론 단계에서 예외가 발생하면 파이프라인을 정지한 뒤 같은 예외 발생
+        """
+        self.start()
+        try:
+            for _, frame, result in self.results():
+                if self.render_fn(frame, result) is False:
+                    break
+        finally:
+            self.stop()
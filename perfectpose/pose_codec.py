@@ -0,0 +1,73 @@
+import struct
+
+import numpy as np
+
+from perfectpose.pose_frame import NUM_KEYPOINTS, PoseFrame
+
+# 📌 포즈 데이터 바이너리 프레임 형식 (WebSocket 스트리밍용)
+# - 헤더 (20 bytes, little-endian)
+#   magic "PPKF" (4) | version (1) | dtype (1) | 사람 수 P (2) | frame_id (4) | timestamp (8, float64 monotonic 초)
+# - 사람 ID : P × uint16
+# - 관절 데이터 : P × 17 × 3 (x, y, confidence)
+#   - dtype 0 (float16) : 좌표/신뢰도 그대로 float16
+#   - dtype 1 (uint16)  : 좌표는 픽셀 단위 반올림, 신뢰도는 0~65535로 양자화
+MAGIC = b"PPKF"
+VERSION = 1
+DTYPE_FLOAT16 = 0
+DTYPE_UINT16 = 1
+
+HEADER = struct.Struct("<4sBBHId")
+_CONF_SCALE = 65535.0
+
+
+def encode_frame(pose_frame, frame_id=0, timestamp=0.0, dtype=DTYPE_FLOAT16):
+    """
+    📌 PoseFrame → 바이너리 프레임 (bytes)
+    """
+    keypoints = pose_frame.keypoints
+    if dtype == DTYPE_FLOAT16:
+        values = keypoints.astype("<f2")
+    elif dtype == DTYPE_UINT16:
+        values = np.empty(keypoints.shape, dtype="<u2")
+        values[..., :2] = np.clip(np.rint(keypoints[..., :2]), 0, 65535)
+        values[..., 2] = np.rint(np.clip(keypoints[..., 2], 0.0, 1.0) * _CONF_SCALE)
+    else:
+        raise ValueError(f"지원하지 않는 dtype입니다: {dtype}")
+
+    header = HEADER.pack(MAGIC, VERSION, dtype, len(keypoints), frame_id & 0xFFFFFFFF, timestamp)
+    person_ids = np.asarray(pose_frame.person_ids).astype("<u2")
+    return b"".join((header, person_ids.tobytes(), values.tobytes()))
+
+
+def decode_frame(data):
+    """
+    📌 바이너리 프레임 → (frame_id, timestamp, PoseFrame)
+    """
+    magic, version, dtype, num_people, frame_id, timestamp = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("PPKF 프레임이 아닙니다.")
+    if version != VERSION:
+        raise ValueError(f"지원하지 않는 버전입니다: {version}")
+
+    offset = HEADER.size
+    person_ids = np.frombuffer(data, dtype="<u2", count=num_people, offset=offset).astype(np.int64)
+    offset += num_people * 2
+
+    count = num_people * NUM_KEYPOINTS * 3
+    if dtype == DTYPE_FLOAT16:
+        keypoints = np.frombuffer(data, dtype="<f2", count=count, offset=offset).astype(np.float32)
+    elif dtype == DTYPE_UINT16:
+        keypoints = np.frombuffer(data, dtype="<u2", count=count, offset=offset).astype(np.float32)
+        keypoints = keypoints.reshape(num_people, NUM_KEYPOINTS, 3)
+        keypoints[..., 2] /= _CONF_SCALE
+    else:
+        raise ValueError(f"지원하지 않는 dtype입니다: {dtype}")
+
+    return frame_id, timestamp, PoseFrame(keypoints, person_ids)
+
+
+def frame_size(num_people):
+    """
+    사람 수에 따른 바이너리 프레임 크기 (bytes)
+    """
+    return HEADER.size + num_people * 2 + num_people * NUM_KEYPOINTS * 3 * 2
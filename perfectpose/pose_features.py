@@ -0,0 +1,238 @@
+import numpy as np
+
+from perfectpose.pose_frame import PoseFrame
+from perfectpose.scoring import NUM_KEYPOINTS, keypoints_to_array
+
+# 관절 각도 정의 (COCO 키포인트 포맷 기준) : 이름 -> (끝점 A, 꼭짓점, 끝점 B)
+JOINT_ANGLES = {
+    "left_elbow": (5, 7, 9),
+    "right_elbow": (6, 8, 10),
+    "left_shoulder": (11, 5, 7),
+    "right_shoulder": (12, 6, 8),
+    "left_hip": (5, 11, 13),
+    "right_hip": (6, 12, 14),
+    "left_knee": (11, 13, 15),
+    "right_knee": (12, 14, 16),
+}
+
+ANGLE_NAMES = list(JOINT_ANGLES)
+_ANGLE_TRIPLETS = np.array(list(JOINT_ANGLES.values()), dtype=np.intp)
+
+
+def _person_keypoints(people, person_id=None):
+    # 사람 목록 [{"person_id", "keypoints"}, ...]에서 한 명의 키포인트 목록 선택 (없으면 None)
+    # - person_id가 None이면 첫 번째 사람
+    for index, person in enumerate(people):
+        if person_id is None or person.get("person_id", index + 1) == person_id:
+            return person["keypoints"]
+    return None
+
+
+def _frame_keypoints(frame, person_id=None):
+    # 프레임 한 개 → 한 사람의 키포인트 목록 (사람이 없으면 None)
+    if isinstance(frame, dict):
+        if "pose" in frame:                 # to_response() / 캡처 기록 {"image_name", "pose": [...]}
+            return _person_keypoints(frame["pose"], person_id)
+        if "keypoints" in frame:            # 사람 한 명 {"person_id", "keypoints": [...]}
+            return frame["keypoints"]
+        raise ValueError(f"알 수 없는 포즈 데이터 형식입니다: {sorted(frame)}")
+
+    frame = list(frame)
+    if frame and isinstance(frame[0], dict) and "keypoints" in frame[0]:
+        return _person_keypoints(frame, person_id)      # 한 프레임의 사람 목록 (pose_data)
+    return frame                                        # 키포인트 목록
+
+
+def as_pose_array(data, person_id=None):
+    """
+    📌 여러 형태의 포즈 데이터를 한 사람의 (N, 17, 3) 포즈 시퀀스 배열로 변환
+    - 배열 (17, 3) / (N, 17, 3) : 그대로 사용 (N = 프레임 수), (N, P, 17, 3) : 사람 한 명 선택
+    - PoseFrame : 프레임 한 개 (사람 한 명 선택)
+    - 키포인트 목록 [{"id", "x", "y", "confidence"}, ...]
+    - pose_data 형식 [{"person_id", "keypoints": [...]}, ...] : 프레임 한 개의 사람 목록 (사람 한 명 선택)
+    - 응답/기록 형식 {"pose": [...]} (to_response(), process_pose(), 캡처 기록) 또는 그 리스트 (프레임 시퀀스)
+    - 프레임별 키포인트 목록 / pose_data의 리스트 (프레임 시퀀스)
+    - person_id: 선택할 사람 ID (None이면 프레임마다 첫 번째 사람), 해당 사람이 없는 프레임은 제외
+    """
+    if isinstance(data, PoseFrame):
+        data = data.keypoints[None]
+    if isinstance(data, np.ndarray):
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim == 4:
+            return data[:, 0 if person_id is None else person_id - 1]
+        return data.reshape(-1, NUM_KEYPOINTS, 3)
+
+    if isinstance(data, dict):
+        frames = [data]
+    else:
+        data = list(data)
+        if not data:
+            return np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+        first = data[0]
+        if isinstance(first, np.ndarray):
+            return as_pose_array(np.stack(data), person_id)
+        if isinstance(first, dict) and ("id" in first or ("keypoints" in first and "pose" not in first)):
+            frames = [data]                 # 키포인트 목록 또는 한 프레임의 사람 목록
+        else:
+            frames = data                   # 프레임 시퀀스
+
+    poses = [_frame_keypoints(frame, person_id) for frame in frames]
+    poses = [keypoints_to_array(keypoints) for keypoints in poses if keypoints is not None]
+    if not poses:
+        return np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+    return np.stack(poses)
+
+
+def joint_angles(poses, conf_threshold=0.5):
+    """
+    📌 (N, 17, 3) 포즈 배열에서 관절 각도(도) 계산
+    - 출력: (N, A) 배열 (A = JOINT_ANGLES 개수, 순서는 ANGLE_NAMES)
+    - 세 점 중 하나라도 신뢰도가 conf_threshold 이하이면 nan
+    """
+    poses = np.asarray(poses, dtype=np.float32)
+    if poses.ndim == 2:
+        poses = poses[None]
+
+    a = poses[:, _ANGLE_TRIPLETS[:, 0]]             # (N, A, 3)
+    vertex = poses[:, _ANGLE_TRIPLETS[:, 1]]
+    b = poses[:, _ANGLE_TRIPLETS[:, 2]]
+
+    va = a[..., :2] - vertex[..., :2]
+    vb = b[..., :2] - vertex[..., :2]
+    norms = np.linalg.norm(va, axis=-1) * np.linalg.norm(vb, axis=-1)
+    valid = (a[..., 2] > conf_threshold) & (vertex[..., 2] > conf_threshold) & (b[..., 2] > conf_threshold) & (norms > 0)
+
+    cos = np.sum(va * vb, axis=-1) / np.where(valid, norms, 1.0)
+    angles = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+    return np.where(valid, angles, np.nan).astype(np.float32)
+
+
+def pose_signature(data, bin_deg=15, conf_threshold=0.5):
+    """
+    📌 포즈(또는 포즈 시퀀스)를 양자화된 관절 각도 시그니처 문자열로 변환
+    - 프레임별 관절 각도의 중앙값을 bin_deg 단위로 나눈 구간 번호 (보이지 않는 관절은 "x")
+    - 비슷한 자세는 같은 시그니처가 되어 캐시 키로 사용 가능
+    - 예: "left_elbow=11,right_elbow=10,...,right_knee=x"
+    """
+    angles = joint_angles(as_pose_array(data), conf_threshold)
+    if len(angles):
+        valid = ~np.isnan(angles)
+        counts = valid.sum(0)
+        # 보이는 프레임이 있는 각도만 중앙값 계산
+        median = np.full(angles.shape[1], np.nan, dtype=np.float32)
+        if counts.any():
+            median[counts > 0] = np.nanmedian(angles[:, counts > 0], axis=0)
+    else:
+        median = np.full(len(ANGLE_NAMES), np.nan, dtype=np.float32)
+
+    bins = ["x" if np.isnan(value) else str(int(value // bin_deg)) for value in median.tolist()]
+    return ",".join(f"{name}={b}" for name, b in zip(ANGLE_NAMES, bins))
+
+
+# 좌우 비교할 관절 각도 쌍 : 이름 -> (왼쪽, 오른쪽)
+SYMMETRY_PAIRS = {
+    "elbow": ("left_elbow", "right_elbow"),
+    "shoulder": ("left_shoulder", "right_shoulder"),
+    "hip": ("left_hip", "right_hip"),
+    "knee": ("left_knee", "right_knee"),
+}
+
+# 자세 플래그 기준 : 지표 -> (기준값, 설명)
+POSTURE_FLAGS = {
+    "shoulder_tilt": (5.0, "어깨 높이 비대칭"),
+    "hip_tilt": (5.0, "골반 높이 비대칭"),
+    "trunk_lean": (10.0, "몸통 기울어짐"),
+    "head_offset": (0.25, "머리가 어깨 중심에서 벗어남 (거북목/측면 기울기 의심)"),
+}
+
+
+def _line_tilt(poses, left, right, conf_threshold):
+    # 좌우 관절을 잇는 선의 수평 대비 기울기 (도), 보이지 않으면 nan
+    dx = poses[:, right, 0] - poses[:, left, 0]
+    dy = poses[:, right, 1] - poses[:, left, 1]
+    valid = (poses[:, left, 2] > conf_threshold) & (poses[:, right, 2] > conf_threshold)
+    tilt = np.degrees(np.arctan2(np.abs(dy), np.abs(dx)))
+    return np.where(valid, tilt, np.nan)
+
+
+def posture_metrics(poses, conf_threshold=0.5):
+    """
+    📌 프레임별 자세 지표 계산 (보이지 않는 관절이 있으면 nan)
+    - shoulder_tilt / hip_tilt: 양쪽 어깨 / 골반을 잇는 선의 기울기 (도)
+    - trunk_lean: 어깨 중심 → 골반 중심 선의 수직 대비 기울기 (도)
+    - head_offset: 귀 중심과 어깨 중심의 수평 거리 / 몸통 길이
+    """
+    poses = as_pose_array(poses)
+    visible = poses[..., 2] > conf_threshold
+
+    shoulder_mid = poses[:, [5, 6], :2].mean(1)
+    hip_mid = poses[:, [11, 12], :2].mean(1)
+    ear_mid = poses[:, [3, 4], :2].mean(1)
+    torso = hip_mid - shoulder_mid
+    torso_length = np.linalg.norm(torso, axis=-1)
+
+    shoulders = visible[:, 5] & visible[:, 6]
+    hips = visible[:, 11] & visible[:, 12]
+    ears = visible[:, 3] & visible[:, 4]
+    trunk_valid = shoulders & hips & (torso_length > 0)
+
+    trunk_lean = np.degrees(np.arctan2(np.abs(torso[:, 0]), np.abs(torso[:, 1])))
+    head_offset = (ear_mid[:, 0] - shoulder_mid[:, 0]) / np.where(trunk_valid, torso_length, 1.0)
+    return {
+        "shoulder_tilt": _line_tilt(poses, 5, 6, conf_threshold),
+        "hip_tilt": _line_tilt(poses, 11, 12, conf_threshold),
+        "trunk_lean": np.where(trunk_valid, trunk_lean, np.nan),
+        "head_offset": np.where(trunk_valid & ears, head_offset, np.nan),
+    }
+
+
+def _nan_stats(values):
+    # (중앙값, 최소, 최대), 값이 없으면 None
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    return float(np.median(values)), float(values.min()), float(values.max())
+
+
+def summarize_pose(data, conf_threshold=0.5):
+    """
+    📌 포즈(또는 포즈 시퀀스)를 LLM 프롬프트용 짧은 요약 텍스트로 변환
+    - 관절 각도 표 (중앙값, 시퀀스면 최소~최대), 좌우 각도 차이, 자세 지표와 이상 플래그
+    - 원본 키포인트 JSON 대비 프롬프트 토큰 수를 크게 줄임
+    """
+    poses = as_pose_array(data)
+    angles = joint_angles(poses, conf_threshold) if len(poses) else np.zeros((0, len(ANGLE_NAMES)))
+    lines = [f"프레임 수: {len(poses)}", "", "관절 각도 (도):"]
+
+    medians = {}
+    for i, name in enumerate(ANGLE_NAMES):
+        stats = _nan_stats(angles[:, i])
+        if stats is None:
+            lines.append(f"- {name}: 측정 불가")
+            continue
+        medians[name] = stats[0]
+        if len(poses) > 1:
+            lines.append(f"- {name}: {stats[0]:.0f} ({stats[1]:.0f}~{stats[2]:.0f})")
+        else:
+            lines.append(f"- {name}: {stats[0]:.0f}")
+
+    lines += ["", "좌우 각도 차이 (도):"]
+    for name, (left, right) in SYMMETRY_PAIRS.items():
+        if left in medians and right in medians:
+            lines.append(f"- {name}: {abs(medians[left] - medians[right]):.0f}")
+
+    lines += ["", "자세 지표:"]
+    flags = []
+    for name, values in posture_metrics(poses, conf_threshold).items():
+        stats = _nan_stats(values)
+        if stats is None:
+            continue
+        threshold, description = POSTURE_FLAGS[name]
+        value = f"{stats[0]:.2f}" if name == "head_offset" else f"{stats[0]:.0f}도"
+        lines.append(f"- {name}: {value}")
+        if abs(stats[0]) > threshold:
+            flags.append(f"- {description} ({name} {stats[0]:.2f}, 기준 {threshold})")
+
+    lines += ["", "자세 플래그:"] + (flags or ["- 없음"])
+    return "\n".join(lines)
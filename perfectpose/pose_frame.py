@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import numpy as np
+
+# 각 키포인트(관절)의 좌표 순번 : COCO Dataset 기준
+KEYPOINT_NAMES = [
+    "nose",             # 0  Nose(코)                      얼굴 중심점
+    "left_eye",         # 1  Left Eye(왼쪽 눈)             얼굴 왼쪽 위치
+    "right_eye",        # 2  Right Eye (오른쪽 눈)         얼굴 오른쪽 위치
+    "left_ear",         # 3  Left Ear (왼쪽 귀)            얼굴 왼쪽 끝
+    "right_ear",        # 4  Right Ear (오른쪽 귀)         얼굴 오른쪽 끝
+    "left_shoulder",    # 5  Left Shoulder (왼쪽 어깨)     상체 위치
+    "right_shoulder",   # 6  Right Shoulder (오른쪽 어깨)  상체 위치
+    "left_elbow",       # 7  Left Elbow (왼쪽 팔꿈치)      팔 관절
+    "right_elbow",      # 8  Right Elbow (오른쪽 팔꿈치)   팔 관절
+    "left_wrist",       # 9  Left Wrist (왼쪽 손목)        손 위치
+    "right_wrist",      # 10 Right Wrist (오른쪽 손목)     손 위치
+    "left_hip",         # 11 Left Hip (왼쪽 엉덩이)        하체 위치
+    "right_hip",        # 12 Right Hip (오른쪽 엉덩이)     하체 위치
+    "left_knee",        # 13 Left Knee (왼쪽 무릎)         다리 관절
+    "right_knee",       # 14 Right Knee (오른쪽 무릎)      다리 관절
+    "left_ankle",       # 15 Left Ankle (왼쪽 발목)        발 위치
+    "right_ankle",      # 16 Right Ankle (오른쪽 발목)     발 위치
+]
+
+NUM_KEYPOINTS = len(KEYPOINT_NAMES)
+
+
+class PoseFrame:
+    """
+    📌 프레임 한 장의 포즈 데이터 (감지된 모든 사람)
+    - keypoints: (P, 17, 3) float32 배열 (x, y, confidence), P = 감지된 사람 수
+    - person_ids: (P,) 사람 ID (기본값 1, 2, ...)
+    - JSON/딕셔너리 형태는 to_pose_data(), to_response() 호출 시에만 생성
+    """
+
+    __slots__ = ("keypoints", "person_ids", "timestamp")
+
+    def __init__(self, keypoints, person_ids=None, timestamp=None):
+        self.keypoints = np.asarray(keypoints, dtype=np.float32).reshape(-1, NUM_KEYPOINTS, 3)
+        self.person_ids = np.arange(1, len(self.keypoints) + 1) if person_ids is None else np.asarray(person_ids)
+        self.timestamp = timestamp or datetime.utcnow()
+
+    @classmethod
+    def from_result(cls, result, timestamp=None):
+        """
+        YOLO 추론 결과(Result) 하나로 PoseFrame 생성
+        - result.keypoints.data (P, 17, 3)를 한 번에 CPU로 복사
+        """
+        if result.keypoints is None:
+            return cls(np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32), timestamp=timestamp)
+        return cls(result.keypoints.data.cpu().numpy(), timestamp=timestamp)
+
+    @classmethod
+    def from_results(cls, results, timestamp=None):
+        """
+        YOLO 추론 결과 목록(이미지 여러 장)을 PoseFrame 리스트로 변환
+        """
+        return [cls.from_result(result, timestamp) for result in results]
+
+    def __len__(self):
+        return len(self.keypoints)
+
+    @property
+    def xy(self):
+        return self.keypoints[..., :2]
+
+    @property
+    def conf(self):
+        return self.keypoints[..., 2]
+
+    def to_pose_data(self, conf_threshold=0.5):
+        """
+        📌 사람 단위 Keypoints 리스트로 변환 (기존 pose_data 형식)
+        - [{"person_id": 1, "keypoints": [{"id", "x", "y", "confidence"}, ...]}, ...]
+        - 신뢰도 conf_threshold 초과인 관절만 포함
+        """
+        xs = self.keypoints[..., 0].astype(np.int64).tolist()
+        ys = self.keypoints[..., 1].astype(np.int64).tolist()
+        scores = self.keypoints[..., 2].tolist()
+        visible = (self.keypoints[..., 2] > conf_threshold).tolist()
+
+        pose_data = []
+        for p, person_id in enumerate(self.person_ids.tolist()):
+            pose_data.append({
+                "person_id": person_id,
+                "keypoints": [
+                    {"id": i, "x": xs[p][i], "y": ys[p][i], "confidence": scores[p][i]}
+                    for i in range(NUM_KEYPOINTS) if visible[p][i]
+                ]
+            })
+        return pose_data
+
+    def to_response(self, conf_threshold=0.5):
+        """
+        📌 최종 응답 데이터 구조 (JSON 형태 : FastAPI Data Default)
+        """
+        return {
+            "status": "success",
+            "pose": self.to_pose_data(conf_threshold),
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+    def draw(self, frame, conf_threshold=0.5, radius=5, color=(0, 255, 0)):
+        """
+        신뢰도 conf_threshold 초과인 관절을 프레임에 원으로 표시
+        """
+        import cv2
+
+        for x, y in self.xy[self.conf > conf_threshold].astype(np.int64).tolist():
+            cv2.circle(frame, (x, y), radius, color, -1)
+        return frame
@@ -0,0 +1,134 @@
+import json
+import os
+import time
+
+
+class PoseStreamWriter:
+    """
+    📌 프레임 단위 포즈 데이터를 JSONL(한 줄 = 한 프레임)로 이어 쓰는 저장 클래스
+    - 매 프레임 파일 전체를 다시 쓰지 않으므로 세션 길이와 상관없이 프레임당 비용 일정
+    - 버퍼링 후 fsync_every 프레임 또는 fsync_interval 초마다 디스크에 동기화
+    - 비정상 종료 시에도 마지막 동기화 시점까지의 데이터는 보존
+    - 기존 파일에 이어 쓸 때 마지막 줄이 잘려 있으면(기록 도중 종료) 잘린 줄을 지우고 이어 씀
+    """
+
+    def __init__(self, path, fsync_every=30, fsync_interval=1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.count = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _truncate_partial_line(path)
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, record):
+        """
+        프레임 데이터(dict) 한 개를 한 줄로 추가
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.count += 1
+        self._pending += 1
+
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """
+        버퍼 내용을 디스크까지 기록
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _truncate_partial_line(path, chunk_size=4096):
+    """
+    파일이 줄바꿈으로 끝나지 않으면 마지막 줄바꿈 뒤의 잘린 줄을 삭제 (이어 쓰기 전 호출)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            file.seek(start)
+            index = file.read(position - start).rfind(b"\n")
+            if index >= 0:
+                position = start + index + 1
+                break
+            position = start
+        if position < end:
+            file.truncate(position)
+
+
+def iter_pose_records(path):
+    """
+    📌 JSONL 포즈 파일을 한 줄씩 읽는 제너레이터 (파일 전체를 메모리에 올리지 않음)
+    - 비정상 종료로 잘린 줄이나 JSON으로 읽을 수 없는 줄은 건너뜀
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            if not line.endswith("\n"):
+                break                                   # 기록 도중 잘린 마지막 줄
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue                                # 손상된 줄
+
+
+def convert_jsonl_to_json(jsonl_path, json_path, indent=2):
+    """
+    📌 JSONL 포즈 파일을 기존 JSON 배열 형식(pose_data.json)으로 한 번에 변환
+    - 레코드를 하나씩 읽어 쓰므로 긴 세션도 메모리 사용량 일정
+    - 임시 파일에 쓴 뒤 교체하여 변환 도중 종료되어도 기존 파일 보존
+    """
+    tmp_path = json_path + ".tmp"
+    count = 0
+    pad = " " * indent if indent else ""
+
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for record in iter_pose_records(jsonl_path):
+            text = json.dumps(record, ensure_ascii=False, indent=indent or None)
+            if indent:
+                text = "\n" + "\n".join(pad + line for line in text.splitlines())
+            if count:
+                file.write("," if indent else ", ")
+            file.write(text)
+            count += 1
+        file.write("\n]" if indent and count else "]")
+
+    os.replace(tmp_path, json_path)
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSONL 포즈 파일 → JSON 배열 변환")
+    parser.add_argument("jsonl_path", help="입력 JSONL 파일 (예: pose_data.jsonl)")
+    parser.add_argument("json_path", help="출력 JSON 파일 (예: pose_data.json)")
+    parser.add_argument("--indent", type=int, default=2, help="JSON 들여쓰기 (0이면 한 줄)")
+    args = parser.parse_args()
+
+    total = convert_jsonl_to_json(args.jsonl_path, args.json_path, indent=args.indent)
+    print(f"{total}개 프레임 변환 완료: {args.json_path}")
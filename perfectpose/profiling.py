@@ -0,0 +1,234 @@
+import contextlib
+import json
+import math
+import os
+import time
+
+# 히스토그램 구간 : 1us부터 2배마다 SUB_BUCKETS개씩 나눈 로그 구간 (상대 오차 약 9% 이내)
+SUB_BUCKETS = 8
+NUM_BUCKETS = SUB_BUCKETS * 28                  # 최대 약 2^28 us (약 4.5분)
+
+# Prometheus 출력용 구간 경계 (초)
+PROMETHEUS_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+# 비활성화 시 사용하는 빈 컨텍스트 (기록 없음)
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class LatencyHistogram:
+    """
+    📌 HDR 방식 로그 구간 지연 시간 히스토그램
+    - 값 하나 기록 = 구간 번호 계산 + 리스트 원소 1 증가 (메모리 고정, 정렬 없음)
+    - percentile()은 해당 구간의 상한값 반환
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        us = seconds * 1e6
+        index = int(math.log2(us) * SUB_BUCKETS) if us > 1.0 else 0
+        self.counts[min(index, NUM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def bucket_upper(index):
+        # 구간 상한값 (초)
+        return 2 ** ((index + 1) / SUB_BUCKETS) / 1e6
+
+    def percentile(self, q):
+        """
+        q 백분위 지연 시간 (초), 기록이 없으면 0
+        """
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def count_below(self, bound):
+        """
+        bound(초) 이하 구간에 기록된 개수 (Prometheus 누적 구간용)
+        """
+        return sum(count for index, count in enumerate(self.counts) if count and self.bucket_upper(index) <= bound)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(float(self.total) / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(float(self.max) * 1000, 3),
+        }
+
+
+class _Stage:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class StageProfiler:
+    """
+    📌 실시간 루프 단계별 지연 시간 측정기
+    - with profiler.stage("predict"): ... 형태로 단계 구간 측정
+    - tick(): 프레임 1장 처리 완료 시 호출 (FPS 및 프레임 간격 "frame" 기록)
+    - enabled=False 이면 stage()가 빈 컨텍스트를 반환하여 측정 비용 없음
+    - dump_interval초마다 maybe_dump()에서 JSON/Prometheus 텍스트로 저장 (dump_path가 없으면 print)
+    """
+
+    def __init__(self, enabled=True, dump_path=None, dump_format="json", dump_interval=10.0):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.dump_format = dump_format
+        self.dump_interval = dump_interval
+        self.histograms = {}
+
+        self._last_tick = None
+        self._last_dump = time.monotonic()
+        self._fps = 0.0
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def stage(self, name):
+        """
+        단계 구간 측정용 컨텍스트
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self.histogram(name))
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def wrap(self, name, fn):
+        """
+        함수 호출 전체를 name 단계로 측정하도록 감싼 함수 반환 (비활성화 시 원래 함수)
+        """
+        if not self.enabled:
+            return fn
+        histogram = self.histogram(name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - start)
+
+        return timed
+
+    def tick(self):
+        """
+        프레임 1장 처리 완료 (프레임 간격 기록 + FPS 지수 평균 갱신)
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            interval = now - self._last_tick
+            self.histogram("frame").record(interval)
+            if interval > 0:
+                self._fps = 1.0 / interval if not self._fps else 0.9 * self._fps + 0.1 / interval
+        self._last_tick = now
+
+    @property
+    def fps(self):
+        return self._fps
+
+    def summary(self):
+        """
+        📌 단계별 통계 {"fps", "stages": {단계: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}}
+        """
+        return {
+            "fps": round(self._fps, 2),
+            "stages": {name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+    def to_json(self):
+        return json.dumps(self.summary(), ensure_ascii=False)
+
+    def to_prometheus(self, prefix="perfectpose"):
+        """
+        📌 Prometheus 텍스트 형식 (단계별 histogram + FPS gauge)
+        """
+        metric = f"{prefix}_stage_seconds"
+        lines = [f"# TYPE {metric} histogram"]
+        for name, histogram in self.histograms.items():
+            for bound in PROMETHEUS_BOUNDS:
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {histogram.count_below(bound)}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {histogram.total:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {histogram.count}')
+        lines += [f"# TYPE {prefix}_fps gauge", f"{prefix}_fps {self._fps:.2f}"]
+        return "\n".join(lines) + "\n"
+
+    def dump(self):
+        """
+        현재 통계를 dump_path에 저장 (임시 파일 기록 후 교체), dump_path가 없으면 print
+        """
+        text = self.to_prometheus() if self.dump_format == "prometheus" else self.to_json() + "\n"
+        if self.dump_path is None:
+            print(text, end="")
+            return
+        temp_path = f"{self.dump_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, self.dump_path)
+
+    def maybe_dump(self):
+        """
+        dump_interval초가 지났으면 dump() 실행
+        """
+        if not self.enabled or self.dump_interval is None:
+            return
+        now = time.monotonic()
+        if now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump()
+
+    def draw_overlay(self, frame, stages=None, origin=(10, 20), color=(0, 255, 255)):
+        """
+        📌 미리보기 화면에 FPS와 단계별 p50/p95 지연 시간 표시
+        """
+        if not self.enabled:
+            return frame
+        import cv2
+
+        lines = [f"FPS {self._fps:.1f}"]
+        for name in stages or self.histograms:
+            histogram = self.histograms.get(name)
+            if histogram is not None and histogram.count:
+                lines.append(f"{name} {histogram.percentile(50) * 1000:.1f}/{histogram.percentile(95) * 1000:.1f} ms")
+
+        x, y = origin
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (x, y + i * 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+        return frame
@@ -0,0 +1,110 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+
+class SamEmbeddingCache:
+    """
+    📌 SAM 이미지 인코더 결과(embedding)를 디스크에 저장하는 캐시
+    - 키: 이미지 내용 해시 + 모델 종류(vit_h 등) + 인코더 입력 크기
+    - 같은 이미지를 다시 처리하면 인코더(ViT)를 건너뛰고 프롬프트 디코더만 실행
+    - 전체 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - 여러 작업 프로세스가 같은 cache_dir를 함께 사용 가능 (다른 프로세스가 먼저 삭제한 파일은 캐시 미스로 처리)
+    """
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, image, model_type, img_size):
+        digest = hashlib.sha1(np.ascontiguousarray(image).data)
+        digest.update(f"{image.shape}|{image.dtype}|{model_type}|{img_size}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def set_image(self, predictor, image, model_type):
+        """
+        📌 predictor.set_image 대신 사용 (image: RGB numpy 배열)
+        - 캐시에 있으면 저장된 embedding으로 predictor 상태만 설정
+        - 없으면 인코더를 실행한 뒤 결과를 캐시에 저장
+        - 출력: 캐시 적중 여부
+        """
+        import torch
+
+        key = self._key(image, model_type, predictor.model.image_encoder.img_size)
+        path = self._path(key)
+
+        try:
+            with np.load(path) as cached:
+                predictor.reset_image()
+                predictor.original_size = tuple(int(v) for v in cached["original_size"])
+                predictor.input_size = tuple(int(v) for v in cached["input_size"])
+                predictor.features = torch.from_numpy(cached["features"]).to(predictor.device)
+                predictor.is_image_set = True
+        except FileNotFoundError:
+            pass                                                # 캐시 없음 (또는 다른 프로세스가 삭제)
+        except (OSError, ValueError, KeyError):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)                                 # 손상된 캐시 파일은 삭제 후 다시 계산
+        else:
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)                                  # 최근 사용 시각 갱신 (LRU)
+            self.hits += 1
+            return True
+
+        predictor.set_image(image)
+        self.misses += 1
+        self._save(path, predictor)
+        return False
+
+    def _save(self, path, predictor):
+        # 프로세스별 임시 파일에 저장 후 교체 (다른 프로세스는 저장이 끝난 파일만 읽음)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp.npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    features=predictor.features.detach().cpu().numpy(),
+                    original_size=np.asarray(predictor.original_size),
+                    input_size=np.asarray(predictor.input_size),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """
+        캐시 용량이 max_bytes를 넘으면 오래 사용하지 않은 파일부터 삭제
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz") or name.endswith(".tmp.npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue                                        # 다른 프로세스가 이미 삭제
+            entries.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from perfectpose.pose_stream import PoseStreamWriter, iter_pose_records
+from perfectpose.sam_render import RENDER_STYLES, save_contours, simplify_contours
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# 작업 프로세스마다 한 번만 불러오는 모델 (YOLO 검출기, SAM predictor, embedding 캐시)
+_worker = {}
+
+
+def _init_worker(detector_path, sam_checkpoint, model_type, torch_threads, cache_dir):
+    """
+    📌 작업 프로세스 초기화 : 프로세스마다 YOLO 검출기와 SAM 모델을 한 번씩 불러옴
+    - torch_threads: 프로세스당 torch 연산 스레드 수 (프로세스 수 x 스레드 수 ≒ CPU 코어 수 권장)
+    """
+    import torch
+    from segment_anything import sam_model_registry, SamPredictor
+    from perfectpose.model_registry import get_model
+    from perfectpose.sam_cache import SamEmbeddingCache
+
+    if torch_threads:
+        torch.set_num_threads(torch_threads)
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    sam = sam_model_registry[model_type](checkpoint=sam_checkpoint)
+    sam.to(device=device)
+
+    _worker["device"] = device
+    _worker["model_type"] = model_type
+    _worker["detector"] = get_model(detector_path, task="detect", warmup_runs=0)
+    _worker["predictor"] = SamPredictor(sam)
+    _worker["cache"] = SamEmbeddingCache(cache_dir) if cache_dir else None
+
+
+def _process_image(image_path, output_dir, style, conf, export, epsilon):
+    """
+    📌 이미지 한 장 처리 : 사람 검출 → SAM 마스크 생성 → 결과 저장
+    - 검출된 사람이 없으면 SAM 인코더를 실행하지 않고 바로 건너뜀
+    - export가 "json"/"npz"면 단순화한 외곽선 좌표도 함께 저장
+    - 출력: 매니페스트에 기록할 결과 딕셔너리
+    """
+    import torch
+
+    image_name = os.path.basename(image_path)
+
+    # 이미지 로드
+    image = cv2.imread(image_path)
+    if image is None:
+        return {"image": image_name, "status": "error", "error": "이미지를 불러올 수 없습니다."}
+
+    # 객체 검출 수행 후 경계 상자 추출
+    results = _worker["detector"].predict(source=image, conf=conf, verbose=False)
+    bboxes = results[0].boxes.xyxy.cpu().numpy()
+    if len(bboxes) == 0:
+        return {"image": image_name, "status": "no_detection"}
+
+    # SAM에 이미지 설정 (캐시가 있으면 embedding 재사용)
+    predictor = _worker["predictor"]
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    if _worker["cache"] is not None:
+        _worker["cache"].set_image(predictor, image_rgb, _worker["model_type"])
+    else:
+        predictor.set_image(image_rgb)
+
+    # 경계 상자를 사용하여 세그멘테이션 마스크 생성
+    transformed_boxes = predictor.transform.apply_boxes_torch(torch.tensor(bboxes, dtype=torch.float32), image_rgb.shape[:2])
+    with torch.no_grad():
+        masks, _, _ = predictor.predict_torch(
+            point_coords=None,
+            point_labels=None,
+            boxes=transformed_boxes.to(_worker["device"]),
+            multimask_output=False
+        )
+    masks = masks[:, 0].cpu().numpy()
+
+    # 결과 저장
+    record = {"image": image_name, "status": "done", "boxes": int(len(bboxes))}
+    stem = os.path.splitext(image_name)[0]
+    if style in RENDER_STYLES:
+        render, suffix = RENDER_STYLES[style]
+        record["output"] = stem + suffix
+        cv2.imwrite(os.path.join(output_dir, record["output"]), render(masks, image.shape))
+    if export:
+        record["contours"] = f"{stem}_contours.{export}"
+        save_contours(os.path.join(output_dir, record["contours"]), simplify_contours(masks, epsilon), image.shape)
+    return record
+
+
+def completed_images(output_dir):
+    """
+    매니페스트에서 처리가 끝난 이미지 이름 목록 읽기 (오류 난 이미지, 손상된 줄의 이미지는 다시 처리)
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return set()
+    return {
+        record["image"] for record in iter_pose_records(manifest_path)
+        if isinstance(record, dict) and "image" in record and record.get("status") != "error"
+    }
+
+
+def run_sam_job(input_dir, output_dir, sam_checkpoint, model_type="vit_h", detector_path="yolov8n.pt",
+                style="mask", conf=0.6, workers=None, torch_threads=None, cache_dir=None, export=None, epsilon=2.0):
+    """
+    📌 폴더 단위 SAM 마스크 생성 작업 (병렬 처리 + 이어하기)
+    - 이미지를 여러 프로세스에 나누어 처리 (프로세스마다 SAM 모델 1개)
+    - 처리 결과는 output_dir/manifest.jsonl에 기록되어 중단 후 다시 실행하면 남은 이미지만 처리
+    - style: "mask" (흰 배경 + 검은 객체), "outline" (투명 배경 + 점선 외곽선), "none" (이미지 저장 안 함)
+    - export: "json" 또는 "npz"면 Douglas-Peucker로 단순화한 외곽선 좌표 저장 (epsilon: 허용 오차, 픽셀)
+    - 출력: 이번 실행에서 처리한 결과 목록
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    done = completed_images(output_dir)
+    image_paths = [
+        os.path.join(input_dir, f) for f in sorted(os.listdir(input_dir))
+        if f.lower().endswith(('.jpg', '.jpeg', '.png')) and f not in done
+    ]
+
+    if not image_paths:
+        print("처리할 이미지가 없습니다. (이미 모두 처리되었거나 폴더가 비어 있음)")
+        return []
+
+    workers = workers or max((os.cpu_count() or 1) // 4, 1)
+    torch_threads = torch_threads or max((os.cpu_count() or 1) // workers, 1)
+    print(f"▶ {len(image_paths)}개 이미지 처리 시작 (완료 {len(done)}개 건너뜀, 프로세스 {workers}개 x 스레드 {torch_threads}개)")
+
+    records = []
+    with PoseStreamWriter(os.path.join(output_dir, MANIFEST_NAME), fsync_every=1) as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(detector_path, sam_checkpoint, model_type, torch_threads, cache_dir)) as pool:
+        futures = {pool.submit(_process_image, path, output_dir, style, conf, export, epsilon): path for path in image_paths}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"image": os.path.basename(futures[future]), "status": "error", "error": str(e)}
+
+            manifest.write(record)
+            records.append(record)
+            print(f"[{len(records)}/{len(image_paths)}] {record['image']} : {record['status']}")
+
+    return records
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="폴더 단위 SAM 마스크 생성 (병렬 처리 + 이어하기)")
+    parser.add_argument("input_dir", help="입력 이미지 폴더")
+    parser.add_argument("output_dir", help="마스크 저장 폴더")
+    parser.add_argument("--checkpoint", required=True, help="SAM 체크포인트 경로 (예: sam_vit_h_4b8939.pth)")
+    parser.add_argument("--model-type", default="vit_h", help="SAM 모델 종류 (vit_h, vit_l, vit_b)")
+    parser.add_argument("--detector", default="yolov8n.pt", help="YOLO 사람 검출 모델")
+    parser.add_argument("--style", default="mask", choices=sorted(RENDER_STYLES) + ["none"], help="출력 스타일")
+    parser.add_argument("--export", default=None, choices=["json", "npz"], help="단순화한 외곽선 좌표 저장 형식")
+    parser.add_argument("--epsilon", type=float, default=2.0, help="외곽선 단순화 허용 오차 (픽셀)")
+    parser.add_argument("--conf", type=float, default=0.6, help="검출 신뢰도 기준")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수")
+    parser.add_argument("--torch-threads", type=int, default=None, help="프로세스당 torch 스레드 수")
+    parser.add_argument("--cache-dir", default=None, help="SAM embedding 캐시 폴더")
+    args = parser.parse_args(argv)
+
+    run_sam_job(args.input_dir, args.output_dir, args.checkpoint, model_type=args.model_type,
+                detector_path=args.detector, style=args.style, conf=args.conf, workers=args.workers,
+                torch_threads=args.torch_threads, cache_dir=args.cache_dir, export=args.export, epsilon=args.epsilon)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+
+import cv2
+import numpy as np
+
+
+def render_mask(masks, shape):
+    """
+    📌 흰색 배경에 객체 부분만 검은색으로 칠한 마스크 이미지 생성
+    - masks: (K, H, W) bool/uint8 마스크 배열
+    - shape: 원본 이미지 (H, W)
+    """
+    segmentation_result = np.full(shape[:2], 255, dtype=np.uint8)      # 흰색 (255)
+    if len(masks):
+        segmentation_result[np.any(masks, axis=0)] = 0                  # 객체 부분을 검은색(0)으로 설정
+    return segmentation_result
+
+
+def _find_contours(masks):
+    """
+    마스크별 외곽선을 찾아 하나의 리스트로 반환
+    """
+    contours = []
+    for mask in masks:
+        found, _ = cv2.findContours(np.asarray(mask, dtype=np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        contours.extend(found)
+    return contours
+
+
+def dash_segments(contours, step=5):
+    """
+    📌 외곽선 점 배열에서 점선 구간 (K, 2, 2)을 한 번에 잘라내기
+    - step 간격마다 (i, i + 1) 두 점을 하나의 선분으로 사용
+    """
+    segments = []
+    for contour in contours:
+        points = contour.reshape(-1, 2)
+        starts = np.arange(0, len(points) - 1, step)
+        if len(starts):
+            segments.append(np.stack([points[starts], points[starts + 1]], axis=1))
+    if not segments:
+        return np.zeros((0, 2, 2), dtype=np.int32)
+    return np.concatenate(segments).astype(np.int32)
+
+
+def render_outline(masks, shape, step=5, thickness=2):
+    """
+    📌 투명한 배경에 객체 외곽선을 흰색 점선으로 그린 RGBA 이미지 생성
+    - masks: (K, H, W) bool/uint8 마스크 배열
+    - shape: 원본 이미지 (H, W)
+    - 점선 구간을 배열로 잘라 cv2.polylines 한 번으로 그림
+    """
+    height, width = shape[:2]
+    transparent_result = np.zeros((height, width, 4), dtype=np.uint8)
+
+    segments = dash_segments(_find_contours(masks), step)
+    if len(segments):
+        cv2.polylines(transparent_result, segments, False, (255, 255, 255, 255), thickness)
+
+    return transparent_result
+
+
+def simplify_contours(masks, epsilon=2.0):
+    """
+    📌 마스크 외곽선을 Douglas-Peucker 알고리즘으로 단순화
+    - epsilon: 원래 외곽선과의 최대 허용 거리 (픽셀, 클수록 점 개수 감소)
+    - 출력: [(P, 2) int32 점 배열, ...]
+    """
+    simplified = []
+    for contour in _find_contours(masks):
+        approx = cv2.approxPolyDP(contour, epsilon, True).reshape(-1, 2)
+        if len(approx) >= 2:
+            simplified.append(approx.astype(np.int32))
+    return simplified
+
+
+def save_contours(path, contours, shape):
+    """
+    📌 단순화된 외곽선을 JSON 또는 NPZ로 저장 (언리얼에서 점 좌표로 바로 그리기 위한 형식)
+    - .json : {"width", "height", "contours": [[[x, y], ...], ...]}
+    - .npz  : points (N, 2) int16, offsets (외곽선별 시작 위치, 마지막은 N), size (H, W)
+    """
+    height, width = shape[:2]
+    if path.endswith(".npz"):
+        lengths = [len(contour) for contour in contours]
+        points = np.concatenate(contours) if contours else np.zeros((0, 2), dtype=np.int32)
+        np.savez_compressed(
+            path,
+            points=points.astype(np.int16),
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32),
+            size=np.array([height, width], dtype=np.int32),
+        )
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({
+                "width": width,
+                "height": height,
+                "contours": [contour.tolist() for contour in contours],
+            }, file, separators=(",", ":"))
+
+
+# 출력 스타일 : (렌더링 함수, 저장 파일 접미사)
+RENDER_STYLES = {
+    "mask": (render_mask, "_mask.jpg"),
+    "outline": (render_outline, "_mask.png"),
+}
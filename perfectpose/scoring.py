@@ -0,0 +1,82 @@
+import numpy as np
+
+# 키포인트 개수 (COCO Dataset 기준)
+NUM_KEYPOINTS = 17
+
+# 주요 관절 벡터 정의 (COCO 키포인트 포맷 기준) : (시작점, 끝점)
+BONE_PAIRS = np.array([
+    (6, 8), (8, 10),        # 오른팔 (어깨-팔꿈치, 팔꿈치-손목)
+    (5, 7), (7, 9),         # 왼팔 (어깨-팔꿈치, 팔꿈치-손목)
+    (12, 14), (14, 16),     # 오른다리 (엉덩이-무릎, 무릎-발목)
+    (11, 13), (13, 15),     # 왼다리 (엉덩이-무릎, 무릎-발목)
+    (6, 12), (5, 11),       # 몸통 (어깨-골반)
+], dtype=np.intp)
+
+
+def keypoints_to_array(keypoints, num_keypoints=NUM_KEYPOINTS):
+    """
+    📌 키포인트 목록({"id","x","y"[,"confidence"]})을 (17, 3) 배열로 변환
+    - 목록에 없는 관절은 신뢰도 0으로 채움
+    - "confidence"가 없는 가이드 키포인트는 신뢰도 1로 간주
+    """
+    array = np.zeros((num_keypoints, 3), dtype=np.float32)
+    for kp in keypoints:
+        array[kp["id"]] = (kp["x"], kp["y"], kp.get("confidence", 1.0))
+    return array
+
+
+def bone_directions(poses, conf_threshold=0.5):
+    """
+    📌 (N, 17, 3) 포즈 배열에서 관절 벡터의 단위 방향 계산
+    - 출력: (N, B, 2) 배열 (B = 관절 벡터 개수)
+    - 양 끝점 신뢰도가 conf_threshold 이하이거나 길이가 0인 벡터는 (0, 0)으로 마스킹
+    """
+    poses = np.asarray(poses, dtype=np.float32)
+    if poses.ndim == 2:
+        poses = poses[None]
+
+    start = poses[:, BONE_PAIRS[:, 0]]              # (N, B, 3)
+    end = poses[:, BONE_PAIRS[:, 1]]                # (N, B, 3)
+    vectors = end[..., :2] - start[..., :2]         # (N, B, 2)
+    norms = np.linalg.norm(vectors, axis=-1)        # (N, B)
+
+    valid = (start[..., 2] > conf_threshold) & (end[..., 2] > conf_threshold) & (norms > 0)
+    safe_norms = np.where(valid, norms, 1.0)[..., None]
+    return np.where(valid[..., None], vectors / safe_norms, 0.0).astype(np.float32)
+
+
+def score_directions(user_dirs, guide_dirs):
+    """
+    📌 관절 방향 배열끼리 정확도 점수 행렬 계산
+    - 입력: (N, B, 2) 사용자 방향, (M, B, 2) 가이드 방향 (bone_directions 출력)
+    - 출력: (N, M) 점수 행렬 (50-100)
+    - 계산 방식: 양쪽 모두 유효한 관절 벡터의 코사인 유사도를 0~1로 정규화한 평균
+    """
+    user_dirs = np.asarray(user_dirs, dtype=np.float32)
+    guide_dirs = np.asarray(guide_dirs, dtype=np.float32)
+    user_valid = np.any(user_dirs != 0, axis=-1).astype(np.float32)     # (N, B)
+    guide_valid = np.any(guide_dirs != 0, axis=-1).astype(np.float32)   # (M, B)
+
+    # 마스킹된 벡터는 (0, 0)이므로 내적 합에 포함되지 않음
+    num_bones = user_dirs.shape[1]
+    cos_sum = user_dirs.reshape(-1, num_bones * 2) @ guide_dirs.reshape(-1, num_bones * 2).T
+    counts = user_valid @ guide_valid.T
+
+    # 유사도 평균 = (코사인 합 + 벡터 개수) / (2 * 벡터 개수)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_similarity = (cos_sum + counts) / (2 * counts)
+
+    # 유효한 벡터가 없으면 기본값(50) 반환
+    return np.where(counts > 0, 50 + avg_similarity * 50, 50.0)
+
+
+def score_matrix(user_poses, guide_poses, conf_threshold=0.5):
+    """
+    📌 여러 사용자 포즈와 여러 가이드 포즈를 한 번에 비교
+    - 입력: (N, 17, 3) 사용자 배열, (M, 17, 3) 가이드 배열 (x, y, confidence)
+    - 출력: (N, M) 정확도 점수 행렬 (50-100)
+    """
+    return score_directions(
+        bone_directions(user_poses, conf_threshold),
+        bone_directions(guide_poses, conf_threshold),
+    )
@@ -0,0 +1,139 @@
+import math
+import time
+
+import cv2
+import numpy as np
+
+from perfectpose.pose_frame import PoseFrame
+
+
+class OneEuroFilter:
+    """
+    📌 One-Euro 필터 (관절 좌표 떨림 제거 + 다음 위치 예측)
+    - 좌표 배열을 한 번에 필터링 (SkipFrameDetector는 사람(person_id)마다 (17, 2) 필터를 따로 사용)
+    - 느리게 움직일 때는 강하게, 빠르게 움직일 때는 약하게 평활화하여 지연을 줄임
+    - min_cutoff: 정지 상태 떨림 제거 정도 (작을수록 강함), beta: 속도에 따른 반응성
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None           # 평활화된 좌표
+        self.dx = None          # 평활화된 속도 (픽셀/초)
+        self.t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t=None):
+        """
+        새 관측 좌표 x를 필터링한 결과 반환 (배열 모양이 바뀌면 상태 초기화)
+        """
+        t = time.monotonic() if t is None else t
+        x = np.asarray(x, dtype=np.float32)
+        if self.x is None or self.x.shape != x.shape or t <= self.t:
+            self.x, self.dx, self.t = x.copy(), np.zeros_like(x), t
+            return self.x.copy()
+
+        dt = t - self.t
+        dx = (x - self.x) / dt
+        self.dx = self.dx + self._alpha(self.d_cutoff, dt) * (dx - self.dx)
+
+        # 속도가 빠를수록 cutoff를 높여 지연 감소 (관절별로 계산)
+        speed = np.linalg.norm(self.dx, axis=-1, keepdims=True)
+        cutoff = self.min_cutoff + self.beta * speed
+        tau = 1.0 / (2 * np.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+
+        self.x = self.x + alpha * (x - self.x)
+        self.t = t
+        return self.x.copy()
+
+    def predict(self, t=None):
+        """
+        마지막 좌표와 속도로 t 시점의 좌표 예측 (감지를 건너뛴 프레임에 사용)
+        """
+        if self.x is None:
+            return None
+        t = time.monotonic() if t is None else t
+        return self.x + self.dx * (t - self.t)
+
+
+def _thumbnail(frame, size=(64, 48)):
+    # 움직임 비교용 축소 흑백 이미지
+    return cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+
+class SkipFrameDetector:
+    """
+    📌 k 프레임마다 한 번만 포즈 모델을 실행하고, 사이 프레임은 필터로 관절 위치를 예측
+    - detect_fn: (frame) -> PoseFrame (예: PoseBackend, RoiPoseDetector)
+    - every: 감지 주기 (1이면 매 프레임 감지, 필터는 떨림 제거에만 사용)
+    - motion_threshold: 지정하면 마지막 감지 이후 화면 변화(평균 밝기 차이, 0~255)가 기준을 넘을 때도 감지
+    - 필터 상태는 person_id별로 유지 (처음 보인 ID는 새 필터로 시작, 사라진 ID의 필터는 삭제)
+    - tracker: detect_fn의 person_id가 프레임 사이에 유지되지 않으면(감지 순서 1..P) PoseTracker()를 넘겨 ID 부여
+    - 출력: 평활화/예측된 좌표의 PoseFrame
+    """
+
+    def __init__(self, detect_fn, every=3, motion_threshold=None, min_cutoff=1.0, beta=0.05, tracker=None):
+        self.detect_fn = detect_fn
+        self.every = max(int(every), 1)
+        self.motion_threshold = motion_threshold
+        self.tracker = tracker
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.filters = {}               # person_id → OneEuroFilter
+        self.detections = 0
+        self.predictions = 0
+
+        self._since_detect = 0
+        self._last = None               # 마지막 감지 결과 (PoseFrame)
+        self._last_thumbnail = None
+
+    def _should_detect(self, frame):
+        if self._last is None or self._since_detect + 1 >= self.every:
+            return True
+        if self.motion_threshold is not None:
+            motion = np.abs(_thumbnail(frame) - self._last_thumbnail).mean()
+            return motion > self.motion_threshold
+        return False
+
+    def __call__(self, frame):
+        now = time.monotonic()
+
+        if self._should_detect(frame):
+            pose_frame = self.detect_fn(frame)
+            if self.tracker is not None:
+                pose_frame = self.tracker.update(pose_frame)
+            self._last = pose_frame
+            self._since_detect = 0
+            self.detections += 1
+            if self.motion_threshold is not None:
+                self._last_thumbnail = _thumbnail(frame)
+
+            # 같은 ID의 사람끼리만 필터 상태를 이어감 (새 ID는 새 필터, 사라진 ID는 삭제)
+            person_ids = [int(person_id) for person_id in pose_frame.person_ids]
+            self.filters = {
+                person_id: self.filters.get(person_id) or OneEuroFilter(min_cutoff=self.min_cutoff, beta=self.beta)
+                for person_id in person_ids
+            }
+            keypoints = pose_frame.keypoints.copy()
+            for i, person_id in enumerate(person_ids):
+                keypoints[i, :, :2] = self.filters[person_id](pose_frame.xy[i], now)
+            return PoseFrame(keypoints, pose_frame.person_ids, pose_frame.timestamp)
+
+        # 감지를 건너뛴 프레임 : 마지막 감지 결과의 신뢰도 + 예측 좌표 사용
+        self._since_detect += 1
+        self.predictions += 1
+        keypoints = self._last.keypoints.copy()
+        for i, person_id in enumerate(self._last.person_ids):
+            predicted = self.filters[int(person_id)].predict(now)
+            if predicted is not None:
+                keypoints[i, :, :2] = predicted
+        return PoseFrame(keypoints, self._last.person_ids)
@@ -0,0 +1,215 @@
+import numpy as np
+
+from perfectpose.pose_frame import NUM_KEYPOINTS, PoseFrame
+
+# OKS 계산용 관절별 표준편차 (COCO Keypoints 평가 기준)
+COCO_SIGMAS = np.array([
+    .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87, .87, .89, .89
+], dtype=np.float32) / 10.0
+
+
+def keypoint_boxes(keypoints, conf_threshold=0.5):
+    """
+    📌 사람별 관절 좌표를 감싸는 경계 상자 (P, 4) xyxy 계산
+    - 신뢰도 기준을 넘는 관절이 없으면 (0, 0, 0, 0)
+    """
+    visible = keypoints[..., 2] > conf_threshold
+    x, y = keypoints[..., 0], keypoints[..., 1]
+    boxes = np.stack([
+        np.where(visible, x, np.inf).min(1), np.where(visible, y, np.inf).min(1),
+        np.where(visible, x, -np.inf).max(1), np.where(visible, y, -np.inf).max(1),
+    ], axis=1)
+    return np.where(visible.any(1)[:, None], boxes, 0.0).astype(np.float32)
+
+
+def box_iou(boxes_a, boxes_b):
+    """
+    경계 상자 IoU 행렬 (A, B) 계산
+    """
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.where(union > 0, union, 1), 0.0)
+
+
+def keypoint_oks(keypoints_a, keypoints_b, conf_threshold=0.5, penalize_missing=False):
+    """
+    📌 관절 유사도 OKS(Object Keypoint Similarity) 행렬 (A, B) 계산
+    - 양쪽 모두 보이는 관절만 사용, 기준 크기는 keypoints_a의 경계 상자 면적
+    - penalize_missing=True면 keypoints_a(기준)에서만 보이는 관절도 0점으로 포함 (모델 출력 비교용)
+    """
+    boxes = keypoint_boxes(keypoints_a, conf_threshold)
+    areas = np.maximum((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]), 1.0)
+
+    diff = keypoints_a[:, None, :, :2] - keypoints_b[None, :, :, :2]       # (A, B, 17, 2)
+    dist2 = np.sum(diff ** 2, axis=-1)                                      # (A, B, 17)
+    visible = (keypoints_a[:, None, :, 2] > conf_threshold) & (keypoints_b[None, :, :, 2] > conf_threshold)
+
+    scale = 2 * areas[:, None, None] * (2 * COCO_SIGMAS) ** 2
+    similarity = np.exp(-dist2 / scale) * visible
+    counts = visible.sum(-1)
+    if penalize_missing:
+        counts = np.broadcast_to((keypoints_a[:, None, :, 2] > conf_threshold).sum(-1), counts.shape)
+    return np.where(counts > 0, similarity.sum(-1) / np.maximum(counts, 1), 0.0)
+
+
+def assign(cost):
+    """
+    📌 비용 행렬에서 최소 비용 1:1 매칭 (Hungarian 알고리즘)
+    - scipy가 있으면 linear_sum_assignment, 없으면 비용 순 탐욕(greedy) 매칭
+    - 출력: (행 인덱스 배열, 열 인덱스 배열)
+    """
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    try:
+        from scipy.optimize import linear_sum_assignment
+        return linear_sum_assignment(cost)
+    except ImportError:
+        pass
+
+    rows, cols = [], []
+    used_rows, used_cols = set(), set()
+    for index in np.argsort(cost, axis=None):
+        r, c = np.unravel_index(index, cost.shape)
+        if r not in used_rows and c not in used_cols:
+            rows.append(r)
+            cols.append(c)
+            used_rows.add(r)
+            used_cols.add(c)
+    return np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+
+
+class PoseTracker:
+    """
+    📌 다인원 포즈 추적기 (프레임 사이 사람 ID 유지)
+    - 이전 프레임의 사람과 현재 감지 결과를 IoU + OKS 유사도로 비교하여 1:1 매칭
+    - 매칭되지 않은 감지 결과는 새 ID 부여, max_missed 프레임 동안 안 보인 사람은 제거
+    """
+
+    def __init__(self, match_threshold=0.3, max_missed=15, conf_threshold=0.5):
+        self.match_threshold = match_threshold
+        self.max_missed = max_missed
+        self.conf_threshold = conf_threshold
+
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.keypoints = np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+        self.missed = np.zeros(0, dtype=np.int64)
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def similarity(self, detections):
+        """
+        추적 중인 사람 (T) 과 감지 결과 (D) 의 유사도 행렬 (T, D)
+        """
+        iou = box_iou(keypoint_boxes(self.keypoints, self.conf_threshold), keypoint_boxes(detections, self.conf_threshold))
+        oks = keypoint_oks(self.keypoints, detections, self.conf_threshold)
+        return 0.5 * iou + 0.5 * oks
+
+    def update(self, pose_frame):
+        """
+        📌 현재 프레임의 감지 결과에 ID를 부여하고 추적 상태 갱신
+        - pose_frame.person_ids를 추적 ID로 바꾼 뒤 그대로 반환
+        """
+        detections = pose_frame.keypoints
+        person_ids = np.zeros(len(detections), dtype=np.int64)
+
+        rows, cols = np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        if len(self.ids) and len(detections):
+            similarity = self.similarity(detections)
+            rows, cols = assign(1.0 - similarity)
+            keep = similarity[rows, cols] >= self.match_threshold
+            rows, cols = rows[keep], cols[keep]
+
+        # 매칭된 사람 : 기존 ID 유지, 관절 좌표 갱신
+        person_ids[cols] = self.ids[rows]
+        self.keypoints[rows] = detections[cols]
+        self.missed += 1
+        self.missed[rows] = 0
+
+        # 매칭되지 않은 감지 결과 : 새 ID 부여
+        new = np.setdiff1d(np.arange(len(detections)), cols)
+        new_ids = np.arange(self._next_id, self._next_id + len(new))
+        self._next_id += len(new)
+        person_ids[new] = new_ids
+
+        # 오래 안 보인 사람 제거 후 새 사람 추가
+        alive = self.missed <= self.max_missed
+        self.ids = np.concatenate([self.ids[alive], new_ids])
+        self.keypoints = np.concatenate([self.keypoints[alive], detections[new]])
+        self.missed = np.concatenate([self.missed[alive], np.zeros(len(new), dtype=np.int64)])
+
+        pose_frame.person_ids = person_ids
+        return pose_frame
+
+    def active_boxes(self):
+        """
+        현재 프레임에서 보인 사람들의 경계 상자 (K, 4) xyxy
+        """
+        return keypoint_boxes(self.keypoints[self.missed == 0], self.conf_threshold)
+
+
+class RoiPoseDetector:
+    """
+    📌 추적 중인 사람 주변 영역(ROI)만 잘라 추론하는 포즈 감지기
+    - 추적 중인 사람 전체를 감싸는 영역을 margin 비율만큼 넓혀 잘라낸 뒤 roi_size로 추론
+    - 추적 대상이 없거나, 사람 수가 줄었거나, refresh_every 프레임마다 전체 프레임으로 다시 감지 (새 참가자 발견)
+    - model은 전용 인스턴스 사용 (get_model(..., instance="roi")) : ultralytics는 마지막 imgsz를 predictor에
+      저장하므로 공유 모델을 쓰면 imgsz를 넘기지 않는 다른 호출자도 roi_size로 추론됨
+    - 출력: 추적 ID가 부여된 PoseFrame (좌표는 원본 프레임 기준)
+    """
+
+    def __init__(self, model, tracker=None, roi_size=320, full_size=640, margin=0.25, refresh_every=15):
+        self.model = model
+        self.tracker = tracker or PoseTracker()
+        self.roi_size = roi_size
+        self.full_size = full_size
+        self.margin = margin
+        self.refresh_every = refresh_every
+        self._frame_index = 0
+        self._force_full = True
+
+    def roi(self, frame_shape):
+        """
+        추적 중인 사람 전체를 감싸는 ROI (x1, y1, x2, y2) 계산, 추적 대상이 없으면 None
+        """
+        boxes = self.tracker.active_boxes()
+        boxes = boxes[(boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])]
+        if not len(boxes):
+            return None
+
+        height, width = frame_shape[:2]
+        x1, y1 = boxes[:, :2].min(0)
+        x2, y2 = boxes[:, 2:].max(0)
+        pad_x, pad_y = (x2 - x1) * self.margin, (y2 - y1) * self.margin
+        return (
+            int(max(x1 - pad_x, 0)), int(max(y1 - pad_y, 0)),
+            int(min(x2 + pad_x, width)), int(min(y2 + pad_y, height)),
+        )
+
+    def __call__(self, frame):
+        self._frame_index += 1
+        roi = None
+        if not self._force_full and self._frame_index % self.refresh_every != 0:
+            roi = self.roi(frame.shape)
+
+        if roi is None:
+            results = self.model.predict(frame, imgsz=self.full_size, verbose=False)
+            pose_frame = PoseFrame.from_result(results[0])
+        else:
+            x1, y1, x2, y2 = roi
+            results = self.model.predict(frame[y1:y2, x1:x2], imgsz=self.roi_size, verbose=False)
+            pose_frame = PoseFrame.from_result(results[0])
+            pose_frame.keypoints[..., 0] += x1                  # ROI 좌표 → 원본 프레임 좌표
+            pose_frame.keypoints[..., 1] += y1
+
+        # 추적 중인 사람보다 적게 감지되면 다음 프레임은 전체 프레임으로 감지
+        self._force_full = len(pose_frame) < int(np.sum(self.tracker.missed == 0))
+        return self.tracker.update(pose_frame)
@@ -0,0 +1,263 @@
+import cv2
+import numpy as np
+
+from perfectpose.model_registry import get_model
+from perfectpose.pose_frame import NUM_KEYPOINTS, PoseFrame
+
+# ViTPose 모델 및 입력 설정 (VitPoseImageProcessor 기본값과 동일)
+VITPOSE_MODEL = "usyd-community/vitpose-base-simple"
+INPUT_SIZE = (192, 256)             # (너비, 높이)
+BOX_PADDING = 1.25                  # 사람 상자를 넓혀서 자르는 비율
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+DARK_KERNEL = 11                    # DARK 보정 가우시안 커널 크기 (post_process_pose_estimation의 kernel_size)
+
+
+def boxes_to_center_size(boxes, input_size=INPUT_SIZE, padding=BOX_PADDING):
+    """
+    📌 사람 상자 (K, 4) xyxy → 자를 영역의 중심 (K, 2), 크기 (K, 2)
+    - 모델 입력 비율(너비:높이)에 맞게 짧은 쪽을 늘린 뒤 padding배 확대
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    center = (boxes[:, :2] + boxes[:, 2:]) / 2
+    size = np.maximum(boxes[:, 2:] - boxes[:, :2], 1.0)
+
+    aspect = input_size[0] / input_size[1]
+    width = np.maximum(size[:, 0], size[:, 1] * aspect)
+    height = np.maximum(size[:, 1], size[:, 0] / aspect)
+    return center, np.stack([width, height], axis=1) * padding
+
+
+def udp_warp_matrix(center, size, input_size=INPUT_SIZE):
+    """
+    📌 자를 영역 → 모델 입력 변환 행렬 (2, 3) (UDP : Unbiased Data Processing, 회전 없음)
+    - 영역 크기를 픽셀 간격 기준 (입력 크기 - 1)로 맞춤 (VitPoseImageProcessor의 get_warp_matrix와 동일)
+    """
+    (cx, cy), (w, h) = center, size
+    sx, sy = (input_size[0] - 1) / w, (input_size[1] - 1) / h
+    return np.array([[sx, 0, (w / 2 - cx) * sx], [0, sy, (h / 2 - cy) * sy]], dtype=np.float32)
+
+
+def crop_people(frame, centers, sizes, input_size=INPUT_SIZE):
+    """
+    📌 프레임에서 사람 영역을 잘라 모델 입력 크기로 변환 (PIL 변환 없이 numpy/cv2만 사용)
+    - UDP 변환 행렬로 warpAffine (영역 밖은 0으로 채움)
+    - 출력: (K, 3, H, W) float32 (RGB, ImageNet 정규화)
+    """
+    crops = np.empty((len(centers), input_size[1], input_size[0], 3), dtype=np.uint8)
+    for k, (center, size) in enumerate(zip(centers.tolist(), sizes.tolist())):
+        crops[k] = cv2.warpAffine(frame, udp_warp_matrix(center, size, input_size), input_size,
+                                  flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+
+    # BGR → RGB, 0~1 스케일, 정규화를 한 번에 처리
+    pixels = crops[..., ::-1].astype(np.float32) / 255.0
+    pixels = (pixels - IMAGENET_MEAN) / IMAGENET_STD
+    return np.ascontiguousarray(pixels.transpose(0, 3, 1, 2))
+
+
+def dark_refine(coords, heatmaps, kernel=DARK_KERNEL):
+    """
+    📌 DARK 보정 : 최댓값 주변 로그 히트맵의 2차 테일러 전개로 부분 픽셀 위치 추정 (벡터 연산)
+    - coords: (K, 17, 2) 히트맵 최댓값 위치, heatmaps: (K, 17, h, w)
+    - 가우시안(sigma 0.8) 평활화 → log → 1차/2차 미분으로 보정 (VitPoseImageProcessor와 같은 계산)
+    """
+    num_people, num_joints, height, width = heatmaps.shape
+    ksize = 2 * ((kernel - 1) // 2) + 1
+    blurred = np.empty_like(heatmaps)
+    for k in range(num_people):
+        # 관절 축을 채널로 두고 한 번에 평활화 (scipy gaussian_filter reflect 모드 = BORDER_REFLECT)
+        smoothed = cv2.GaussianBlur(heatmaps[k].transpose(1, 2, 0), (ksize, ksize), 0.8, borderType=cv2.BORDER_REFLECT)
+        blurred[k] = smoothed.reshape(height, width, num_joints).transpose(2, 0, 1)
+
+    padded = np.pad(np.log(np.clip(blurred, 0.001, 50)), ((0, 0), (0, 0), (1, 1), (1, 1)), mode="edge")
+    x = coords[..., 0].astype(np.intp) + 1
+    y = coords[..., 1].astype(np.intp) + 1
+    k, j = np.ogrid[:num_people, :num_joints]
+
+    def at(dy, dx):
+        return padded[k, j, y + dy, x + dx]
+
+    center = at(0, 0)
+    dx = 0.5 * (at(0, 1) - at(0, -1))
+    dy = 0.5 * (at(1, 0) - at(-1, 0))
+    dxx = at(0, 1) - 2 * center + at(0, -1)
+    dyy = at(1, 0) - 2 * center + at(-1, 0)
+    dxy = 0.5 * (at(1, 1) - at(0, 1) - at(1, 0) + 2 * center - at(0, -1) - at(-1, 0) + at(-1, -1))
+
+    hessian = np.stack([np.stack([dxx, dxy], -1), np.stack([dxy, dyy], -1)], -2)
+    hessian += np.finfo(np.float32).eps * np.eye(2, dtype=hessian.dtype)
+    offset = np.linalg.solve(hessian, np.stack([dx, dy], -1)[..., None])[..., 0]
+    return coords - offset
+
+
+def heatmaps_to_keypoints(heatmaps, centers, sizes, kernel=DARK_KERNEL):
+    """
+    📌 히트맵 (K, 17, h, w) → 원본 프레임 좌표 키포인트 (K, 17, 3) (벡터 연산)
+    - 최댓값 위치 → DARK 부분 픽셀 보정 → UDP 좌표 복원 (VitPoseImageProcessor.post_process_pose_estimation과 동일)
+    - 신뢰도는 히트맵 최댓값
+    """
+    heatmaps = np.asarray(heatmaps, dtype=np.float32)
+    num_people, num_joints, height, width = heatmaps.shape
+    flat = heatmaps.reshape(num_people, num_joints, -1)
+
+    index = flat.argmax(-1)
+    conf = np.take_along_axis(flat, index[..., None], -1)[..., 0]
+    coords = np.stack([index % width, index // width], -1).astype(np.float32)
+    coords = np.where(conf[..., None] > 0, coords, -1.0)       # 최댓값이 0 이하인 관절은 (-1, -1)
+    coords = dark_refine(coords, heatmaps, kernel)
+
+    # 히트맵 좌표 → 원본 프레임 좌표 (UDP : 픽셀 간격 기준 (크기 - 1)로 복원)
+    keypoints = np.empty((num_people, num_joints, 3), dtype=np.float32)
+    keypoints[..., 0] = coords[..., 0] * (sizes[:, None, 0] / (width - 1)) + (centers[:, None, 0] - sizes[:, None, 0] / 2)
+    keypoints[..., 1] = coords[..., 1] * (sizes[:, None, 1] / (height - 1)) + (centers[:, None, 1] - sizes[:, None, 1] / 2)
+    keypoints[..., 2] = conf
+    return keypoints
+
+
+class ViTPoseEstimator:
+    """
+    📌 Top-down ViTPose 포즈 추정기
+    - 1단계: YOLO 사람 감지 모델로 프레임별 사람 상자 검출 (여러 프레임을 한 번에 추론)
+    - 2단계: 모든 프레임의 사람 영역을 잘라 ViTPose에 max_batch개씩 묶어 한 번에 추론
+    - detector=None 이면 프레임 전체를 사람 상자 하나로 사용 (기존 방식)
+    - 출력: 프레임별 PoseFrame 리스트
+    """
+
+    def __init__(self, model_name=VITPOSE_MODEL, device=None, detector="yolov8n.pt", det_conf=0.5, max_batch=16):
+        self.model_name = model_name
+        self.device = device
+        self.detector = detector
+        self.det_conf = det_conf
+        self.max_batch = max_batch
+        self._model = None
+
+    def resolve_device(self):
+        """
+        device=None이면 GPU가 있을 때 cuda, 없으면 cpu로 결정 (사람 감지 모델과 ViTPose가 같은 장치 사용)
+        """
+        if self.device is None:
+            import torch
+
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        return self.device
+
+    def load(self):
+        """
+        ViTPose 모델을 처음 사용할 때 한 번만 불러옴
+        """
+        if self._model is None:
+            from transformers import VitPoseForPoseEstimation
+
+            self.resolve_device()
+            self._model = VitPoseForPoseEstimation.from_pretrained(self.model_name).to(self.device).eval()
+        return self._model
+
+    def detect_people(self, frames):
+        """
+        프레임 리스트 → 프레임별 사람 상자 (K, 4) xyxy 리스트
+        """
+        if self.detector is None:
+            return [np.array([[0, 0, f.shape[1], f.shape[0]]], dtype=np.float32) for f in frames]
+
+        detector = get_model(self.detector, task="detect", device=self.resolve_device())
+        results = detector.predict(list(frames), classes=[0], conf=self.det_conf, verbose=False)
+        return [result.boxes.xyxy.cpu().numpy().astype(np.float32) for result in results]
+
+    def _forward(self, pixels):
+        # (K, 3, H, W) → 히트맵 (K, 17, h, w), max_batch개씩 나눠 추론
+        import torch
+
+        model = self.load()
+        heatmaps = []
+        with torch.no_grad():
+            for start in range(0, len(pixels), self.max_batch):
+                batch = torch.from_numpy(pixels[start:start + self.max_batch]).to(self.device)
+                heatmaps.append(model(pixel_values=batch).heatmaps.float().cpu().numpy())
+        return np.concatenate(heatmaps)
+
+    def infer(self, frames, boxes=None):
+        """
+        📌 프레임 리스트의 포즈 추정
+        - boxes: 프레임별 사람 상자 리스트 (None이면 detect_people로 검출)
+        """
+        frames = list(frames)
+        boxes = self.detect_people(frames) if boxes is None else [np.asarray(b, dtype=np.float32).reshape(-1, 4) for b in boxes]
+
+        # 모든 프레임의 사람 영역을 하나의 배치로 모음
+        centers, sizes, crops, counts = [], [], [], []
+        for frame, frame_boxes in zip(frames, boxes):
+            center, size = boxes_to_center_size(frame_boxes)
+            centers.append(center)
+            sizes.append(size)
+            crops.append(crop_people(frame, center, size))
+            counts.append(len(frame_boxes))
+
+        if sum(counts) == 0:
+            return [PoseFrame(np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)) for _ in frames]
+
+        centers, sizes = np.concatenate(centers), np.concatenate(sizes)
+        heatmaps = self._forward(np.concatenate(crops))
+        keypoints = heatmaps_to_keypoints(heatmaps, centers, sizes)
+
+        # 프레임별로 다시 나눔
+        offsets = np.cumsum([0] + counts)
+        return [PoseFrame(keypoints[offsets[i]:offsets[i + 1]]) for i in range(len(frames))]
+
+    __call__ = infer
+
+
+def check_parity(processor=None, seed=0):
+    """
+    📌 transformers VitPoseImageProcessor와 전처리/후처리 결과 비교 (transformers, torch 필요)
+    - 고정된 합성 프레임/사람 상자/히트맵으로 비교
+      crop_people ↔ processor(images, boxes), heatmaps_to_keypoints ↔ post_process_pose_estimation
+    - 출력: {"max_pixel_error": 모델 입력(정규화 값) 최대 차이, "max_keypoint_error": 키포인트 좌표 최대 차이(픽셀)}
+    """
+    from types import SimpleNamespace
+
+    import torch
+    from transformers import VitPoseImageProcessor
+
+    processor = processor or VitPoseImageProcessor()
+    rng = np.random.default_rng(seed)
+
+    # 프레임 안쪽에 있는 사람 상자 2개 (xyxy, processor 입력은 COCO xywh)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8), (0, 0), 3)
+    boxes = np.array([[120, 60, 300, 420], [400, 100, 520, 300]], dtype=np.float32)
+    coco_boxes = [np.concatenate([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]], 1).tolist()]
+    centers, sizes = boxes_to_center_size(boxes)
+
+    expected = processor(images=frame[..., ::-1].copy(), boxes=coco_boxes, return_tensors="pt")["pixel_values"].numpy()
+    actual = crop_people(frame, centers, sizes)
+
+    # 관절마다 부분 픽셀 위치에 가우시안 봉우리가 있는 히트맵 (K, 17, 64, 48)
+    height, width = INPUT_SIZE[1] // 4, INPUT_SIZE[0] // 4
+    peaks = rng.uniform([2, 2], [width - 3, height - 3], (len(boxes), NUM_KEYPOINTS, 2))
+    ys, xs = np.mgrid[:height, :width]
+    distance = (xs - peaks[..., 0, None, None]) ** 2 + (ys - peaks[..., 1, None, None]) ** 2
+    heatmaps = np.exp(-distance / (2 * 2.0 ** 2)).astype(np.float32)
+
+    results = processor.post_process_pose_estimation(
+        SimpleNamespace(heatmaps=torch.from_numpy(heatmaps)), boxes=coco_boxes, kernel_size=DARK_KERNEL
+    )[0]
+    expected_keypoints = np.stack([result["keypoints"].numpy() for result in results])
+    keypoints = heatmaps_to_keypoints(heatmaps, centers, sizes)
+
+    return {
+        "max_pixel_error": float(np.abs(actual - expected).max()),
+        "max_keypoint_error": float(np.abs(keypoints[..., :2] - expected_keypoints).max()),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    # 📌 VitPoseImageProcessor 대비 전처리/후처리 일치 확인 : python -m perfectpose.vitpose
+    # - 모델 입력은 uint8 보간 반올림 차이(1/255)까지, 키포인트는 0.01픽셀까지 허용
+    report = check_parity()
+    print(json.dumps(report, indent=2))
+    if report["max_pixel_error"] > 2 / 255 / IMAGENET_STD.min() or report["max_keypoint_error"] > 0.01:
+        print("❌ VitPoseImageProcessor와 결과가 다릅니다.")
+        sys.exit(1)
+    print("✅ VitPoseImageProcessor와 결과 일치")
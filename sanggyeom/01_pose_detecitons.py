@@ -1,20 +1,25 @@
-import torch
+import os
+import sys
 import cv2
-import numpy as np
-from PIL import Image
-from transformers import AutoProcessor, VitPoseForPoseEstimation
 
-# 📌 1. GPU 설정 (사용 가능하면 CUDA, 아니면 CPU)
-device = "cuda" if torch.cuda.is_available() else "cpu"
-print(device)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.backends import create_backend
+from perfectpose.vitpose import VITPOSE_MODEL
 
-# 📌 2. ViTPose 모델 및 프로세서 로드
-model_name = "usyd-community/vitpose-base-simple"
-pose_processor = AutoProcessor.from_pretrained(model_name)
-pose_model = VitPoseForPoseEstimation.from_pretrained(model_name).to(device)
-pose_model.eval()
+# 📌 1. 포즈 백엔드 설정 (perfectpose.backends, 실시간 루프와 같은 인터페이스/출력 형식)
+# - 기본값 "vitpose" : Top-down (YOLO 사람 감지 → 사람 영역만 잘라 ViTPose 추론), 가이드 제작용 정확도 우선
+# - POSE_BACKEND=yolo 로 실행하면 YOLO-Pose 사용
+# - 모델은 첫 추론 시 불러오며, GPU가 있으면 CUDA 사용
+# - BATCH_FRAMES개 프레임을 모아 사람 감지/포즈 추정을 한 번에 실행
+BATCH_FRAMES = 8
+BACKEND_OPTIONS = {
+    "vitpose": dict(model_name=VITPOSE_MODEL, detector="yolov8n.pt", max_batch=16),
+    "yolo": dict(weights="yolov8n-pose.pt"),
+}
+backend_name = os.environ.get("POSE_BACKEND", "vitpose")
+backend = create_backend(backend_name, **BACKEND_OPTIONS.get(backend_name, {}))
 
-# 📌 3. 동영상 로드
+# 📌 2. 동영상 로드
 video_path = "./tests/KSG/data/sample1_360.mp4"  # 입력 동영상 파일
 output_path = "./tests/KSG/data/sample1_360_out.mp4"  # 결과 저장 파일
 
@@ -32,52 +37,50 @@ skeleton = [
     (5, 6), (11, 12), (5, 11), (6, 12)  # 몸통 연결
 ]
 
-# 📌 4. 동영상 프레임별 처리 루프
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    # 📌 4-1. OpenCV 프레임을 PIL 이미지로 변환
-    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    image_pil = Image.fromarray(image)
 
-    # 📌 4-2. ViTPose 모델 입력 전처리 (boxes 수정)
-    boxes = [[0, 0, frame_width, frame_height]]  # (x1, y1, x2, y2) 형식
-    inputs_pose = pose_processor(images=image_pil, boxes=boxes, return_tensors="pt").to(device)
+def draw_and_show(frames):
+    """
+    📌 버퍼에 모인 프레임들의 포즈를 한 번에 추정한 뒤 시각화/저장
+    - 반환값: 'q' 키를 누르면 False
+    """
+    for frame, pose_frame in zip(frames, backend.infer(frames)):
+        # 📌 3-1. 포즈 시각화 (신뢰도 50% 이상인 관절만)
+        pose_frame.draw(frame, conf_threshold=0.5, radius=4)
 
-    with torch.no_grad():
-        outputs_pose = pose_model(**inputs_pose)
+        # 📌 3-2. 관절 연결선 (스켈레톤) 시각화 (감지된 모든 사람)
+        for keypoints in pose_frame.keypoints:
+            for pt1, pt2 in skeleton:
+                if keypoints[pt1][2] > 0.5 and keypoints[pt2][2] > 0.5:
+                    x1, y1 = int(keypoints[pt1][0]), int(keypoints[pt1][1])
+                    x2, y2 = int(keypoints[pt2][0]), int(keypoints[pt2][1])
+                    cv2.line(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)  # 관절 연결선 시각화
 
-    # 포즈 데이터 후처리
-    pose_results = pose_processor.post_process_pose_estimation(outputs_pose, boxes=boxes, threshold=0.3)
-    image_pose_result = pose_results[0]  # 첫 번째 이미지의 결과
+        # 📌 3-3. 결과 프레임 저장
+        out.write(frame)
 
-    # 📌 4-3. 포즈 시각화
-    for person_pose in image_pose_result:
-        for keypoint, label, score in zip(person_pose["keypoints"], person_pose["labels"], person_pose["scores"]):
-            if score.item() > 0.5:  # 신뢰도 50% 이상인 경우만 시각화
-                x, y = int(keypoint[0].item()), int(keypoint[1].item())
-                cv2.circle(frame, (x, y), 4, (0, 255, 0), -1)  # 관절 점 시각화
+        # 📌 3-4. 화면 출력 (실시간 보기, 'q' 키로 종료 가능)
+        cv2.imshow('Pose Detection', frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            return False
+    return True
 
-    # 📌 4-4. 관절 연결선 (스켈레톤) 시각화
-    for pt1, pt2 in skeleton:
-        if len(image_pose_result) > 0:
-            keypoints = image_pose_result[0]["keypoints"]
-            if keypoints[pt1][2] > 0.5 and keypoints[pt2][2] > 0.5:
-                x1, y1 = int(keypoints[pt1][0]), int(keypoints[pt1][1])
-                x2, y2 = int(keypoints[pt2][0]), int(keypoints[pt2][1])
-                cv2.line(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)  # 관절 연결선 시각화
 
-    # 📌 4-5. 결과 프레임 저장
-    out.write(frame)
-
-    # 📌 4-6. 화면 출력 (실시간 보기, 'q' 키로 종료 가능)
-    cv2.imshow('Pose Detection', frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+# 📌 3. 동영상 프레임 처리 루프 (BATCH_FRAMES개씩 묶어서 처리)
+buffer = []
+running = True
+while cap.isOpened() and running:
+    ret, frame = cap.read()
+    if not ret:
         break
+    buffer.append(frame)
+    if len(buffer) == BATCH_FRAMES:
+        running = draw_and_show(buffer)
+        buffer = []
+
+if running and buffer:
+    draw_and_show(buffer)
 
-# 📌 5. 리소스 해제
+# 📌 4. 리소스 해제
 cap.release()
 out.release()
 cv2.destroyAllWindows()
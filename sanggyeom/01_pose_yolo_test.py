@@ -1,9 +1,10 @@
-import torch
-import numpy as np
+import os
+import sys
 from ultralytics import YOLO
 import cv2
-from datetime import datetime
-from typing import List, Dict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.pose_frame import PoseFrame
 
 # 📌 1. YOLO-Pose 모델 로드
 model = YOLO("yolov8n-pose.pt")  # YOLO-Pose 모델 (경량 버전)
@@ -19,36 +20,11 @@ if image is None:
 # 📌 3. YOLO-Pose 모델을 사용하여 포즈 감지
 results = model(image)  # YOLO 모델 실행
 
-# 📌 4. 관절(Keypoints) 좌표 추출
-pose_data = []  # 전체 인식된 사람들의 데이터를 저장
-
-for person_id, result in enumerate(results):
-    keypoints = result.keypoints.xy.cpu().numpy()  # 🟢 GPU → CPU 변환
-    scores = result.keypoints.conf.cpu().numpy()  # 🟢 신뢰도 값도 CPU 변환
-
-    # 📌 5. 각 사람별 Keypoints 데이터 정리
-    keypoints_list = []
-    for i, (kp, score) in enumerate(zip(keypoints[0], scores[0])):  
-        if score > 0.5:  # 신뢰도 50% 이상인 경우만 포함
-            keypoints_list.append({
-                "id": i,  # 관절 ID (COCO 데이터셋 기준)
-                "x": int(kp[0]),  # x 좌표
-                "y": int(kp[1]),  # y 좌표
-                "confidence": float(score)  # 신뢰도 값 (0~1)
-            })
-
-    # 📌 6. 사람 단위로 데이터 저장
-    pose_data.append({
-        "person_id": person_id + 1,  # 감지된 사람 ID
-        "keypoints": keypoints_list  # 관절 리스트
-    })
-
-# 📌 7. 최종 데이터 구조
-pose_response = {
-    "status": "success",  # 요청 성공 여부
-    "pose": pose_data,  # 감지된 포즈 데이터
-    "timestamp": datetime.utcnow().isoformat()  # 타임스탬프
-}
-
-# 📌 8. 데이터 출력 (통신 포맷에 맞춰 가공 완료)
+# 📌 4. 관절(Keypoints) 좌표 추출 (감지된 모든 사람, 한 번에 CPU로 복사)
+pose_frame = PoseFrame.from_result(results[0])
+
+# 📌 5. 최종 데이터 구조 (사람별 Keypoints는 신뢰도 50% 이상인 관절만 포함)
+pose_response = pose_frame.to_response(conf_threshold=0.5)
+
+# 📌 6. 데이터 출력 (통신 포맷에 맞춰 가공 완료)
 print(pose_response)
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from perfectpose.pose_features import pose_signature
+
+
+class LLMResponseCache:
+    """
+    📌 자세 분석 LLM 응답 캐시 (SQLite)
+    - 키: 프롬프트 버전(namespace) + 질환(condition) + 양자화된 관절 각도 시그니처
+      → 원본 키포인트가 조금 달라도 비슷한 자세면 같은 답변 재사용
+    - ttl 초가 지난 응답은 만료, max_entries를 넘으면 가장 오래 사용하지 않은 응답부터 삭제 (LRU)
+    - stats()로 적중률 확인
+    """
+
+    def __init__(self, path="llm_cache.sqlite3", ttl=7 * 24 * 3600, max_entries=1000, bin_deg=15, namespace=""):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bin_deg = bin_deg
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                condition TEXT,
+                signature TEXT,
+                response TEXT,
+                created REAL,
+                accessed REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._conn.commit()
+
+    def make_key(self, condition, pose):
+        """
+        질환 + 자세 데이터로 캐시 키와 시그니처 생성
+        """
+        signature = pose_signature(pose, bin_deg=self.bin_deg)
+        key = hashlib.sha1(f"{self.namespace}|{condition}|{signature}".encode("utf-8")).hexdigest()
+        return key, signature
+
+    def get(self, condition, pose):
+        """
+        캐시된 응답 반환 (없거나 만료되었으면 None)
+        """
+        key, _ = self.make_key(condition, pose)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, condition, pose, response):
+        """
+        응답 저장 후 max_entries 초과분은 LRU 순으로 삭제
+        """
+        key, signature = self.make_key(condition, pose)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, condition, signature, response, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """
+        만료된 응답 모두 삭제, 삭제한 개수 반환
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        """
+        📌 캐시 통계 (적중/실패 횟수, 적중률, 저장된 응답 수)
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
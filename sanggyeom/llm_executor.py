@@ -0,0 +1,203 @@
+import asyncio
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 스트리밍 종료 신호
+_DONE = object()
+
+
+class LLMBusyError(RuntimeError):
+    """
+    대기열이 가득 차서 요청을 받을 수 없을 때 발생
+    """
+
+
+class _StopOnEvent:
+    """
+    📌 생성 중단 조건 (StoppingCriteria 형태)
+    - 취소 이벤트가 설정되었거나 마감 시간이 지나면 다음 토큰에서 생성 중단
+    """
+
+    def __init__(self, cancel_event, deadline=None):
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.cancel_event.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+
+def _make_streamer(tokenizer, on_text):
+    # TextIteratorStreamer와 같은 방식으로 디코딩된 텍스트 조각을 콜백으로 전달
+    from transformers import TextStreamer
+
+    class _CallbackStreamer(TextStreamer):
+        def on_finalized_text(self, text, stream_end=False):
+            if text:
+                on_text(text)
+
+    return _CallbackStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+
+class LLMExecutor:
+    """
+    📌 이벤트 루프를 막지 않는 LLM 추론 실행기
+    - model.generate는 전용 스레드(최대 max_concurrency개)에서 실행, 이벤트 루프는 토큰만 받아 전달
+    - 동시에 받을 수 있는 요청은 실행 중 + 대기 중 합쳐 max_concurrency + max_queue개 (초과 시 LLMBusyError)
+    - stream(prompt): 생성되는 텍스트 조각을 async iterator로 반환
+    - 소비자가 중간에 멈추거나(취소) timeout이 지나면 다음 토큰에서 생성 중단
+    - loader: () -> (model, tokenizer), 첫 요청 시 생성 스레드에서 한 번만 호출
+    """
+
+    def __init__(self, loader, max_concurrency=1, max_queue=8, timeout=120.0):
+        self.loader = loader
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-generate")
+        self._load_lock = threading.Lock()
+        self._model = None
+        self._tokenizer = None
+
+        self.active = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.prompt_tokens = 0
+        self.generated_tokens = 0
+        self.first_token_seconds = collections.deque(maxlen=100)
+
+    def load(self):
+        """
+        모델/토크나이저를 불러옴 (이미 불러왔으면 그대로 반환, 서비스 예열 시 직접 호출 가능)
+        """
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model, self._tokenizer = self.loader()
+        return self._model, self._tokenizer
+
+    def _generate(self, prompt, generate_kwargs, cancel_event, deadline, emit):
+        # 생성 스레드에서 실행 : 텍스트 조각/예외/종료 신호를 emit으로 전달
+        self.active += 1
+        error = None
+        try:
+            if cancel_event.is_set():
+                return
+            # import 실패도 예외로 전달 (try 밖에서 실패하면 슬롯이 반환되지 않고 시간 초과까지 대기)
+            import torch
+            from transformers import StoppingCriteriaList
+
+            model, tokenizer = self.load()
+            inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+            prompt_tokens = inputs["input_ids"].shape[-1]
+            start = time.monotonic()
+            with torch.no_grad():
+                outputs = model.generate(
+                    **inputs,
+                    streamer=_make_streamer(tokenizer, emit),
+                    stopping_criteria=StoppingCriteriaList([_StopOnEvent(cancel_event, deadline)]),
+                    pad_token_id=tokenizer.eos_token_id,
+                    **generate_kwargs,
+                )
+
+            # 프롬프트/생성 토큰 수 기록 (프롬프트가 길수록 CPU prefill 시간이 비례해서 늘어남)
+            generated_tokens = outputs.shape[-1] - prompt_tokens
+            self.prompt_tokens += prompt_tokens
+            self.generated_tokens += generated_tokens
+            print(f"LLM 토큰: 프롬프트 {prompt_tokens}개, 생성 {generated_tokens}개 ({time.monotonic() - start:.1f}s)")
+        except Exception as e:
+            error = e
+        finally:
+            # 슬롯을 먼저 반환한 뒤 결과 전달 (오류를 받은 호출자가 바로 다시 요청해도 거절되지 않도록)
+            self.active -= 1
+            self._slots.release()
+            if error is not None:
+                emit(error)
+            emit(_DONE)
+
+    async def stream(self, prompt, timeout=None, **generate_kwargs):
+        """
+        📌 프롬프트에 대한 응답을 텍스트 조각 단위로 스트리밍
+        - 예: async for text in executor.stream(prompt, max_new_tokens=512): ...
+        - timeout 초가 지나면 생성을 중단하고 TimeoutError 발생
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise LLMBusyError("LLM 요청 대기열이 가득 찼습니다.")
+
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        cancel_event = threading.Event()
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 : 더 전달할 곳이 없으므로 생성 중단
+                cancel_event.set()
+
+        self._pool.submit(self._generate, prompt, generate_kwargs, cancel_event, deadline, emit)
+
+        first = True
+        finished = False
+        try:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"LLM 응답 시간 초과 ({timeout}s)")
+                try:
+                    item = await asyncio.wait_for(chunks.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"LLM 응답 시간 초과 ({timeout}s)") from None
+
+                if item is _DONE:
+                    finished = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if first:
+                    self.first_token_seconds.append(time.monotonic() - start)
+                    first = False
+                yield item
+        finally:
+            # 정상 종료가 아니면 (취소/시간 초과/오류) 생성 스레드에 중단 요청
+            if finished:
+                self.completed += 1
+            else:
+                cancel_event.set()
+                self.cancelled += 1
+
+    async def generate(self, prompt, timeout=None, **generate_kwargs):
+        """
+        스트리밍 결과를 모두 모아 전체 응답 문자열로 반환
+        """
+        parts = []
+        async for text in self.stream(prompt, timeout=timeout, **generate_kwargs):
+            parts.append(text)
+        return "".join(parts)
+
+    def stats(self):
+        """
+        📌 실행 통계 (실행 중 요청 수, 완료/취소/거절 수, 첫 토큰까지 걸린 시간)
+        """
+        ttft = list(self.first_token_seconds)
+        return {
+            "active": self.active,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "prompt_tokens": self.prompt_tokens,
+            "generated_tokens": self.generated_tokens,
+            "avg_first_token_seconds": round(sum(ttft) / len(ttft), 3) if ttft else None,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
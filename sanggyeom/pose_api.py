@@ -0,0 +1,358 @@
+"""
+📌 Perfect Pose 자세 인식 API 서버 (FastAPI)
+- 실행: sanggyeom 폴더에서 `uvicorn pose_api:app --host 0.0.0.0 --port 8000`
+- POST /pose : JPEG 바이트(요청 본문 그대로) → process_pose 결과
+- POST /pose/upload : multipart 파일 업로드 → process_pose 결과
+- POST /compare : 사용자/가이드 키포인트 → 정확도 점수
+- WS /ws/pose : JPEG 프레임을 계속 보내면 포즈 결과를 바로 푸시 (?format=binary|json)
+- GET /health, GET /ready : 서버 상태 / 모델 예열 완료 여부
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from sample_pose_estimation import YOLO_POSE_MODEL, compare_poses, get_model, process_pose
+from perfectpose.batching import MicroBatcher
+from perfectpose.pose_codec import DTYPE_FLOAT16, DTYPE_UINT16, encode_frame
+from perfectpose.pose_frame import PoseFrame
+
+try:
+    # orjson이 설치되어 있으면 더 빠른 JSON 직렬화 사용
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    import orjson  # noqa: F401
+except ImportError:
+    FastJSONResponse = JSONResponse
+
+# 추론 스레드 수 (스레드마다 YOLO 모델 1개)
+POSE_WORKERS = int(os.environ.get("POSE_WORKERS", "2"))
+WARMUP_TIMEOUT = float(os.environ.get("POSE_WARMUP_TIMEOUT", "120"))
+
+# 마이크로 배칭 (POSE_BATCH_SIZE > 1 이면 여러 요청의 프레임을 모아 한 번에 추론)
+BATCH_SIZE = int(os.environ.get("POSE_BATCH_SIZE", "1"))
+BATCH_WAIT_MS = float(os.environ.get("POSE_BATCH_WAIT_MS", "5"))
+
+# 동시에 대기할 수 있는 최대 요청 수
+# - 배칭 모드에서는 배치를 채우는 동안 다음 배치도 모일 수 있도록 최소 BATCH_SIZE × 2
+MAX_PENDING = int(os.environ.get("POSE_MAX_PENDING", str(POSE_WORKERS * 4)))
+if BATCH_SIZE > 1:
+    MAX_PENDING = max(MAX_PENDING, BATCH_SIZE * 2)
+
+# 스레드별 모델 인스턴스 번호
+_thread_state = threading.local()
+_instance_counter = iter(range(1_000_000))
+_instance_lock = threading.Lock()
+
+
+def _thread_model():
+    """
+    현재 추론 스레드 전용 YOLO 모델 반환 (없으면 model_registry에서 불러와 예열)
+    """
+    model = getattr(_thread_state, "model", None)
+    if model is None:
+        with _instance_lock:
+            instance = next(_instance_counter)
+        model = get_model(YOLO_POSE_MODEL, task="pose", instance=instance)
+        _thread_state.model = model
+    return model
+
+
+def _warm_up_worker(barrier):
+    # 모든 추론 스레드가 각자 모델을 하나씩 불러오도록 barrier로 대기
+    try:
+        _thread_model()
+    except Exception:
+        barrier.abort()                                 # 다른 스레드가 시간 초과까지 기다리지 않도록 해제
+        raise
+    barrier.wait(timeout=WARMUP_TIMEOUT)
+
+
+def _on_warm_up_done(task):
+    # 예열 작업에서 처리하지 못한 예외도 기록 (await하지 않는 작업이므로 예외가 사라지지 않도록)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"❌ 모델 예열 작업 오류: {task.exception()!r}", file=sys.stderr)
+
+
+def _decode(image_bytes):
+    # 업로드된 바이트를 복사 없이 numpy 배열로 감싼 뒤 디코딩 (실패 시 None)
+    return cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def _infer(image_bytes):
+    """
+    JPEG 바이트 → 이미지 디코딩 → 포즈 감지 (추론 스레드에서 실행)
+    """
+    frame = _decode(image_bytes)
+    if frame is None:
+        return None
+    return process_pose(frame, yolo_model=_thread_model())
+
+
+def _detect_frame(image_bytes):
+    """
+    JPEG 바이트 → PoseFrame (WebSocket 스트리밍용, 추론 스레드에서 실행)
+    """
+    frame = _decode(image_bytes)
+    if frame is None:
+        return None
+    results = _thread_model()(frame, verbose=False)
+    return PoseFrame.from_result(results[0], timestamp=datetime.now())
+
+
+def _batch_model():
+    # 배치 추론 전용 모델 (추론 스레드 모델과 별도 인스턴스)
+    return get_model(YOLO_POSE_MODEL, task="pose", instance="batch")
+
+
+def _detect_batch(frames):
+    """
+    이미지 리스트 → PoseFrame 리스트 (MicroBatcher 스레드에서 한 번의 추론으로 실행)
+    """
+    results = _batch_model()(frames, verbose=False)
+    return PoseFrame.from_results(results, timestamp=datetime.now())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 추론 스레드 풀 생성 및 모델 예열 시작 (예열은 백그라운드에서 진행)
+    - 예열에 실패하면 오류를 출력하고 app.state.warm_up_error에 저장 (/ready가 실패 원인 응답)
+    """
+    app.state.executor = ThreadPoolExecutor(max_workers=POSE_WORKERS, thread_name_prefix="pose-infer")
+    app.state.pending = asyncio.Semaphore(MAX_PENDING)
+    app.state.ready = asyncio.Event()
+    app.state.warm_up_error = None
+    app.state.batcher = None
+    if BATCH_SIZE > 1:
+        # 배칭 모드 : 스레드 풀은 디코딩만 담당하고 추론은 배치 스레드 하나에서 실행
+        app.state.batcher = MicroBatcher(_detect_batch, max_batch=BATCH_SIZE, max_wait_ms=BATCH_WAIT_MS)
+
+    async def warm_up():
+        loop = asyncio.get_running_loop()
+        try:
+            if app.state.batcher is not None:
+                await loop.run_in_executor(app.state.executor, _batch_model)
+                print(f"모델 예열 완료 (배치 크기 최대 {BATCH_SIZE}, 대기 {BATCH_WAIT_MS}ms)")
+            else:
+                barrier = threading.Barrier(POSE_WORKERS)
+                await asyncio.gather(*[
+                    loop.run_in_executor(app.state.executor, _warm_up_worker, barrier) for _ in range(POSE_WORKERS)
+                ])
+                print(f"모델 예열 완료 (추론 스레드 {POSE_WORKERS}개)")
+        except Exception as e:
+            app.state.warm_up_error = f"{type(e).__name__}: {e}"
+            print(f"❌ 모델 예열 실패: {app.state.warm_up_error}", file=sys.stderr)
+            return
+        app.state.ready.set()
+
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+    app.state.warm_up_task.add_done_callback(_on_warm_up_done)
+    yield
+    app.state.warm_up_task.cancel()
+    if app.state.batcher is not None:
+        app.state.batcher.close(timeout=5)
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Perfect Pose API", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+
+async def _detect_batched(image_bytes):
+    # 디코딩은 스레드 풀, 추론은 MicroBatcher에 맡기고 결과 Future를 대기
+    loop = asyncio.get_running_loop()
+    frame = await loop.run_in_executor(app.state.executor, _decode, image_bytes)
+    if frame is None:
+        return None
+    return await asyncio.wrap_future(app.state.batcher.submit(frame))
+
+
+async def detect_pose_frame(image_bytes):
+    """
+    JPEG 바이트 → PoseFrame (배칭 모드면 MicroBatcher, 아니면 추론 스레드 풀 사용)
+    """
+    async with app.state.pending:
+        if app.state.batcher is not None:
+            return await _detect_batched(image_bytes)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(app.state.executor, _detect_frame, image_bytes)
+
+
+async def run_pose(image_bytes):
+    """
+    📌 이벤트 루프를 막지 않도록 추론 스레드 풀에서 포즈 감지 실행
+    - 대기 중인 요청이 MAX_PENDING개를 넘으면 자리가 날 때까지 대기
+    - 배칭 모드면 동시에 들어온 요청들의 프레임을 모아 한 번에 추론
+    """
+    if app.state.warm_up_error is not None:
+        raise HTTPException(status_code=503, detail=f"모델 예열 실패: {app.state.warm_up_error}")
+    if not app.state.ready.is_set():
+        raise HTTPException(status_code=503, detail="모델 예열 중입니다.")
+
+    async with app.state.pending:
+        if app.state.batcher is not None:
+            pose_frame = await _detect_batched(image_bytes)
+            result = None if pose_frame is None else pose_frame.to_response()
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(app.state.executor, _infer, image_bytes)
+
+    if result is None:
+        raise HTTPException(status_code=400, detail="이미지를 디코딩할 수 없습니다.")
+    return result
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready(wait: float = 0.0):
+    """
+    모델 예열 완료 여부 (wait 초 동안 예열이 끝나기를 기다림)
+    - 예열에 실패했으면 500과 실패 원인 응답
+    """
+    if wait > 0:
+        await asyncio.wait({app.state.warm_up_task}, timeout=wait)
+    if app.state.warm_up_error is not None:
+        return FastJSONResponse({"status": "failed", "error": app.state.warm_up_error}, status_code=500)
+    if not app.state.ready.is_set():
+        return FastJSONResponse({"status": "warming_up"}, status_code=503)
+    return {"status": "ready", "workers": POSE_WORKERS, "batch_size": BATCH_SIZE}
+
+
+@app.get("/stats")
+async def stats():
+    """
+    배치 처리 통계 (배칭 모드가 아니면 batching은 null)
+    """
+    batcher = app.state.batcher
+    return {"batching": batcher.stats() if batcher is not None else None}
+
+
+@app.post("/pose")
+async def pose(request: Request):
+    """
+    요청 본문의 JPEG 바이트로 포즈 감지 (Content-Type: image/jpeg)
+    """
+    return await run_pose(await request.body())
+
+
+@app.post("/pose/upload")
+async def pose_upload(file: UploadFile = File(...)):
+    """
+    multipart 파일 업로드로 포즈 감지
+    """
+    return await run_pose(await file.read())
+
+
+class CompareRequest(BaseModel):
+    user_keypoints: List[Dict[str, Any]]
+    guide_keypoints: List[Dict[str, Any]]
+
+
+@app.post("/compare")
+async def compare(body: CompareRequest):
+    """
+    사용자 포즈와 가이드 포즈 비교 (정확도 50-100)
+    """
+    return {"accuracy": compare_poses(body.user_keypoints, body.guide_keypoints)}
+
+
+@app.websocket("/ws/pose")
+async def ws_pose(websocket: WebSocket, format: str = "binary", dtype: str = "float16"):
+    """
+    📌 WebSocket 포즈 스트리밍
+    - 클라이언트: JPEG 프레임을 바이너리 메시지로 계속 전송
+    - 서버: 처리가 끝나는 대로 결과 푸시 (요청/응답 왕복 없음)
+      - format=binary : perfectpose.pose_codec 바이너리 프레임 (dtype=float16|uint16)
+      - format=json   : 디버깅용 JSON ({"frame_id", "timestamp", "pose"})
+    - 추론이 밀리면 가장 최신 프레임만 처리하고 나머지는 버림
+    - 텍스트 메시지를 받으면 1003, 서버 오류가 나면 1011 코드로 연결 종료 (수신/송신 작업 함께 종료)
+    """
+    await websocket.accept()
+    if app.state.warm_up_error is not None:
+        await websocket.close(code=1011, reason="모델 예열 실패")
+        return
+    if not app.state.ready.is_set():
+        await websocket.close(code=1013, reason="모델 예열 중입니다.")
+        return
+
+    binary_dtype = DTYPE_UINT16 if dtype == "uint16" else DTYPE_FLOAT16
+    frames = asyncio.Queue(maxsize=1)
+
+    async def close(code, reason):
+        # 오류 코드로 연결 종료 (이미 닫힌 연결이면 무시)
+        with suppress(Exception):
+            await websocket.close(code=code, reason=reason)
+
+    async def receive():
+        # 수신 루프 : 최신 프레임만 큐에 유지, 종료되면 송신 루프도 중단
+        frame_id = 0
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes")
+                if data is None:
+                    await close(1003, "JPEG 프레임은 바이너리 메시지로 보내야 합니다.")
+                    break
+                frame_id += 1
+                if frames.full():
+                    frames.get_nowait()
+                frames.put_nowait((frame_id, time.monotonic(), data))
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            print(f"WebSocket 수신 오류: {e!r}", file=sys.stderr)
+            await close(1011, "서버 수신 오류")
+        finally:
+            sender.cancel()
+
+    async def send():
+        # 송신 루프 : 최신 프레임 추론 후 결과 푸시, 종료되면 수신 루프도 중단
+        try:
+            while True:
+                frame_id, timestamp, data = await frames.get()
+
+                pose_frame = await detect_pose_frame(data)
+                if pose_frame is None:
+                    continue
+
+                if format == "json":
+                    await websocket.send_json({
+                        "frame_id": frame_id,
+                        "timestamp": timestamp,
+                        "pose": pose_frame.to_pose_data(),
+                    })
+                else:
+                    await websocket.send_bytes(encode_frame(pose_frame, frame_id, timestamp, binary_dtype))
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            print(f"WebSocket 송신 오류: {e!r}", file=sys.stderr)
+            await close(1011, "서버 처리 오류")
+        finally:
+            receiver.cancel()
+
+    # 두 작업 모두 예외를 직접 처리하므로 한쪽이 끝나면 다른 쪽을 취소하고 함께 종료
+    sender = asyncio.create_task(send())
+    receiver = asyncio.create_task(receive())
+    try:
+        await asyncio.gather(sender, receiver, return_exceptions=True)
+    finally:
+        sender.cancel()
+        receiver.cancel()
@@ -1,23 +1,37 @@
 import json
 import asyncio
+import hashlib
+import sys
 from typing import List, Dict, Any, Optional
 import os
 from datetime import datetime
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 프로젝트 루트 (perfectpose 패키지)
+from llm_cache import LLMResponseCache
+from llm_executor import LLMExecutor
+from perfectpose.pose_features import as_pose_array, summarize_pose
 
 # 로컬 모델 설정
 # MODEL_NAME = os.environ.get("LOCAL_MODEL_NAME", "beomi/KoAlpaca-Polyglot-12.8B")
 MODEL_NAME = "Bllossom/llama-3.2-Korean-Bllossom-3B"
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-
-# 모델 및 토크나이저 초기화
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForCausalLM.from_pretrained(
-    MODEL_NAME,
-    device_map=DEVICE,
-    torch_dtype=torch.float16 if DEVICE == "cuda" else torch.float32
-)
+
+def load_llm():
+    """
+    📌 모델 및 토크나이저 초기화
+    - import 시점이 아니라 첫 요청 시(또는 warm_up_llm 호출 시) LLM 실행기 스레드에서 한 번만 실행
+    - torch / transformers도 이때 import
+    """
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForCausalLM.from_pretrained(
+        MODEL_NAME,
+        device_map=device,
+        torch_dtype=torch.float16 if device == "cuda" else torch.float32
+    )
+    return model, tokenizer
 
 # 의학 지식 프롬프트 템플릿
 MEDICAL_EXPERT_PROMPT = """
@@ -36,38 +50,100 @@ MEDICAL_EXPERT_PROMPT = """
 답변은 환자가 이해하기 쉽게 작성해주시고, 의학적으로 정확한 정보를 제공해주세요.
 """
 
+# LLM 실행기 : 생성은 별도 스레드에서 실행되어 이벤트 루프(포즈 API)를 막지 않음
+llm_executor = LLMExecutor(
+    load_llm,
+    max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", "1")),
+    max_queue=int(os.environ.get("LLM_MAX_QUEUE", "8")),
+    timeout=float(os.environ.get("LLM_TIMEOUT", "120")),
+)
+
+def warm_up_llm():
+    """
+    서비스 시작 시 모델을 미리 불러옴 (워커 프로세스를 fork한 뒤에 호출)
+    """
+    return llm_executor.load()
+
+# 생성 옵션 (max_new_tokens : 프롬프트 길이와 관계없이 생성 토큰 수만 제한)
+GENERATE_KWARGS = dict(
+    max_new_tokens=int(os.environ.get("LLM_MAX_NEW_TOKENS", "512")),
+    num_return_sequences=1,
+    temperature=0.7,
+    top_p=0.9,
+    do_sample=True,
+)
+
+async def stream_llm_response(prompt: str):
+    """
+    로컬 LLM 응답을 생성되는 대로 텍스트 조각 단위로 반환합니다. (async iterator)
+    """
+    async for text in llm_executor.stream(prompt, **GENERATE_KWARGS):
+        yield text
+
 async def get_llm_response(prompt: str) -> str:
     """
     로컬 LLM 모델을 사용하여 응답을 생성합니다.
+    - 생성은 LLM 실행기 스레드에서 진행되므로 기다리는 동안 다른 요청을 계속 처리할 수 있음
     """
     try:
-        # 입력 텍스트 토큰화
-        inputs = tokenizer(prompt, return_tensors="pt").to(DEVICE)
-        
-        # 모델 추론
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_length=1024,
-                num_return_sequences=1,
-                temperature=0.7,
-                top_p=0.9,
-                do_sample=True,
-                pad_token_id=tokenizer.eos_token_id
-            )
-        
-        # 출력 디코딩
-        response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        
-        # 프롬프트 부분 제거
-        response = response[len(prompt):].strip()
-        
+        # 프롬프트 부분은 스트리머에서 제외됨
+        response = (await llm_executor.generate(prompt, **GENERATE_KWARGS)).strip()
         return response if response else "응답을 생성하는 중 오류가 발생했습니다."
         
     except Exception as e:
         print(f"모델 추론 오류: {str(e)}")
         return _get_dummy_llm_response(prompt)
 
+# 자세 분석 응답 캐시 : 프롬프트/모델이 바뀌면 namespace가 달라져 이전 응답은 사용하지 않음
+# - import 시점이 아니라 첫 자세 분석 요청 시 생성 (SQLite 파일도 이때 생성)
+_llm_cache = None
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    자세 분석 응답 캐시 반환 (처음 호출 시 생성)
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(
+            os.environ.get("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            ttl=float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+            max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "1000")),
+            namespace=hashlib.sha1(f"{MODEL_NAME}|{MEDICAL_EXPERT_PROMPT}".encode("utf-8")).hexdigest()[:12],
+        )
+    return _llm_cache
+
+async def get_posture_analysis(condition: str, pose_data: Any, bypass_cache: bool = False,
+                               person_id: Optional[int] = None) -> str:
+    """
+    📌 환자 자세 데이터를 분석한 LLM 응답 반환 (MEDICAL_EXPERT_PROMPT 사용)
+    - pose_data: 키포인트 목록, pose_data 형식, process_pose() 응답, 캡처 기록, (N, 17, 3) 배열 등
+      (perfectpose.pose_features.as_pose_array)
+    - person_id: 여러 명이 감지된 경우 분석할 사람 ID (None이면 첫 번째 사람)
+    - 프롬프트에는 원본 키포인트 대신 관절 각도/좌우 차이/자세 플래그 요약(summarize_pose)을 넣음
+    - 같은 질환 + 비슷한 자세(양자화된 관절 각도)는 캐시된 응답을 바로 반환
+    - bypass_cache=True 이면 캐시를 무시하고 새로 생성 (생성 결과는 캐시에 저장)
+    """
+    prompt = MEDICAL_EXPERT_PROMPT.format(condition=condition, data="")
+    try:
+        poses = as_pose_array(pose_data, person_id)
+        if not bypass_cache:
+            cached = get_llm_cache().get(condition, poses)
+            if cached is not None:
+                return cached
+
+        prompt = MEDICAL_EXPERT_PROMPT.format(condition=condition, data=summarize_pose(poses))
+        response = (await llm_executor.generate(prompt, **GENERATE_KWARGS)).strip()
+    except Exception as e:
+        print(f"모델 추론 오류: {str(e)}")
+        return _get_dummy_llm_response(prompt)
+
+    if response:
+        try:
+            get_llm_cache().put(condition, poses, response)
+        except Exception as e:
+            print(f"응답 캐시 저장 오류: {str(e)}")
+    return response or "응답을 생성하는 중 오류가 발생했습니다."
+
 def _get_dummy_llm_response(prompt: str) -> str:
     """
     모델 추론 실패 시 사용할 더미 응답 생성